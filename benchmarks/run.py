@@ -0,0 +1,172 @@
+"""
+Набор бенчмарков горячих путей конвертации и получения курсов.
+
+Работает без сети: API имитируется локальным StubRateServer, кэш-файлы создаются
+во временном каталоге. Результаты выводятся в JSON и сравниваются с сохраненным
+базовым прогоном по минимальному времени (оно меньше всего зависит от фоновой
+нагрузки); при замедлении сверх порога код возврата равен 1. Для сценариев
+короче микросекунды порог мягче: их время заметно колеблется между запусками.
+
+Примеры:
+    python benchmarks/run.py                        # прогон и сравнение с benchmarks/baseline.json
+    python benchmarks/run.py --output results.json  # сохранить результаты
+    python benchmarks/run.py --save-baseline        # обновить базовый прогон
+    python benchmarks/run.py --filter convert_usd   # только сценарии, содержащие подстроку
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stub_server import StubRateServer, sample_payload  # noqa: E402
+from converters import (CrossRateConverter, FixedPointConverter, RateCache, RateFetcher,  # noqa: E402
+                        UsdCnyConverter, UsdEurConverter, UsdGbpConverter, UsdRubConverter)
+from converters.bulk import bulk_convert  # noqa: E402
+from converters.vectorized import get_numpy  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+BULK_SIZE = 1_000_000
+MICRO_CASE_S = 1e-6  # Сценарии короче этого сравниваются с порогом --micro-threshold
+
+
+def new_fetcher(workdir, **kwargs) -> RateFetcher:
+    """Новый экземпляр Singleton RateFetcher с кэшем во временном каталоге."""
+    RateFetcher._instance = None
+    kwargs.setdefault("cache_file", os.path.join(workdir, f"rates-{time.perf_counter_ns()}.cache"))
+    return RateFetcher(**kwargs)
+
+
+def measure(func, number, repeat) -> dict:
+    """Время одного вызова func: медиана и минимум по repeat прогонам из number вызовов."""
+    func()  # Прогрев
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {"median_s": statistics.median(samples), "min_s": min(samples), "number": number, "repeat": repeat}
+
+
+def build_cases(workdir, server, quick):
+    """Сценарии бенчмарка: имя -> (функция, number, repeat)."""
+    scale = 10 if quick else 1
+    cases = {}
+
+    fetcher = new_fetcher(workdir, api_url=server.url)
+    fetcher.fetch_rates()
+    converters = {
+        "RUB": UsdRubConverter(fetcher), "EUR": UsdEurConverter(fetcher), "GBP": UsdGbpConverter(fetcher),
+        "CNY": UsdCnyConverter(fetcher), "JPY": CrossRateConverter(fetcher), "KWD": FixedPointConverter(fetcher),
+    }
+    for currency, converter in converters.items():
+        cases[f"convert_usd[{type(converter).__name__}]"] = (
+            lambda converter=converter, currency=currency: converter.convert_usd(100, currency),
+            20000 // scale, 15)
+
+    def cold_fetch(fail_first=0):
+        server.fail_first = server.requests + fail_first
+        fetcher = new_fetcher(workdir, api_url=server.url, retry_delay=0)
+        assert fetcher.fetch_rates() is not None
+
+    cases["fetch_rates[cold]"] = (cold_fetch, 20 // scale or 1, 5)
+    cases["fetch_rates[cold, 2 retries]"] = (lambda: cold_fetch(fail_first=2), 20 // scale or 1, 5)
+
+    cache = RateCache(os.path.join(workdir, "bench.cache"))
+    payload = dict(sample_payload(), timestamp=time.time())
+    cases["cache[save]"] = (lambda: cache.save(payload), 200 // scale, 5)
+    cache.save(payload)
+    cases["cache[load]"] = (cache.load, 2000 // scale, 5)
+
+    np = get_numpy()
+    amounts = np.arange(BULK_SIZE, dtype=np.float64) if np is not None else [float(i) for i in range(BULK_SIZE)]
+    batch_converter = CrossRateConverter(fetcher)
+    currencies = ["RUB", "EUR", "GBP", "CNY"]
+    cases[f"convert_usd_batch[{BULK_SIZE} x 4]"] = (
+        lambda: batch_converter.convert_usd_batch(amounts, currencies), 1, 5)
+
+    csv_input = "amount\n" + "".join(f"{i}.25\n" for i in range(BULK_SIZE // scale))
+    cases[f"bulk_convert[csv, {BULK_SIZE // scale} rows]"] = (
+        lambda: bulk_convert(io.StringIO(csv_input), io.StringIO(), currencies, rate_fetcher=fetcher), 1, 3)
+    return cases
+
+
+def compare(results, baseline, threshold, micro_threshold) -> list:
+    """
+    Список сценариев, замедлившихся относительно базового прогона.
+
+    Сравнивается минимальное время; для сценариев короче MICRO_CASE_S допустимое
+    замедление — micro_threshold, для остальных — threshold.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        ratio = result["min_s"] / reference["min_s"]
+        result["baseline_ratio"] = round(ratio, 3)
+        if ratio > (micro_threshold if reference["min_s"] < MICRO_CASE_S else threshold):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки конвертации и получения курсов.")
+    parser.add_argument("--output", help="Файл для результатов в JSON (по умолчанию stdout).")
+    parser.add_argument("--baseline", default=BASELINE, help="Файл базового прогона для сравнения.")
+    parser.add_argument("--save-baseline", action="store_true", help="Сохранить результаты как базовый прогон.")
+    parser.add_argument("--threshold", type=float, default=1.3,
+                        help="Допустимое замедление относительно базового прогона (во сколько раз).")
+    parser.add_argument("--micro-threshold", type=float, default=1.6,
+                        help="Допустимое замедление для сценариев короче микросекунды.")
+    parser.add_argument("--filter", default="", help="Запускать только сценарии, содержащие подстроку.")
+    parser.add_argument("--quick", action="store_true", help="Уменьшенное число итераций для быстрой проверки.")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)  # Логи RateFetcher искажают замеры
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir, StubRateServer() as server:
+        for name, (func, number, repeat) in build_cases(workdir, server, args.quick).items():
+            if args.filter in name:
+                results[name] = measure(func, number, repeat)
+                print(f"{name:<44} {results[name]['min_s'] * 1e6:14.2f} us", file=sys.stderr)
+        RateFetcher._instance = None
+
+    regressions = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold,
+                                  args.micro_threshold)
+
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "numpy": getattr(get_numpy(), "__version__", None), "quick": args.quick},
+        "results": results,
+        "regressions": regressions,
+    }
+    text = json.dumps(report, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            f.write(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    elif not args.save_baseline:
+        print(text)
+
+    for name in regressions:
+        print(f"REGRESSION: {name} ({results[name]['baseline_ratio']}x baseline)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
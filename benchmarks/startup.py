@@ -0,0 +1,83 @@
+"""
+Бенчмарк холодного запуска пакета converters и main.py.
+
+Каждый сценарий запускается в отдельном процессе интерпретатора несколько раз,
+выводится медианное время. Дополнительно проверяется, что импорт пакета и создание
+конвертеров не загружают тяжелые зависимости (requests, NumPy).
+
+Пример:
+    python benchmarks/startup.py --repeat 20 --max-ms 150
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "import converters": "import converters",
+    "construct converters": (
+        "from converters import UsdRubConverter, UsdEurConverter, UsdGbpConverter, UsdCnyConverter\n"
+        "UsdRubConverter(); UsdEurConverter(); UsdGbpConverter(); UsdCnyConverter()"
+    ),
+    "main.py --help": None,
+}
+
+HEAVY_MODULES = ("requests", "numpy")
+
+LEAK_CHECK = (
+    "import sys, json\n"
+    "from converters import UsdRubConverter, UsdEurConverter, UsdGbpConverter, UsdCnyConverter\n"
+    "UsdRubConverter(); UsdEurConverter(); UsdGbpConverter(); UsdCnyConverter()\n"
+    f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+)
+
+
+def run_once(code) -> float:
+    """Время одного запуска сценария в миллисекундах."""
+    command = [sys.executable, os.path.join(ROOT, "main.py"), "--help"] if code is None else [sys.executable, "-c", code]
+    start = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def heavy_modules_loaded() -> list:
+    """Список тяжелых модулей, загруженных при импорте пакета и создании конвертеров."""
+    output = subprocess.run([sys.executable, "-c", LEAK_CHECK], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк холодного запуска.")
+    parser.add_argument("--repeat", type=int, default=10, help="Количество запусков каждого сценария.")
+    parser.add_argument("--max-ms", type=float,
+                        help="Порог медианного времени; при превышении код возврата 1.")
+    parser.add_argument("--json", action="store_true", help="Вывод результатов в JSON.")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, code in SCENARIOS.items():
+        run_once(code)  # Прогрев файлового кэша ОС и __pycache__
+        results[name] = statistics.median(run_once(code) for _ in range(args.repeat))
+    leaked = heavy_modules_loaded()
+
+    if args.json:
+        print(json.dumps({"median_ms": results, "heavy_modules_loaded": leaked}, indent=2))
+    else:
+        for name, value in results.items():
+            print(f"{name:<24} {value:8.1f} ms")
+        print(f"heavy modules loaded: {', '.join(leaked) or 'none'}")
+
+    failed = bool(leaked)
+    if args.max_ms is not None:
+        failed = failed or any(value > args.max_ms for value in results.values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Локальный HTTP-сервер, имитирующий API обменных курсов, для бенчмарков и ручных проверок.
+
+Пример:
+    with StubRateServer(fail_first=2) as server:
+        RateFetcher(api_url=server.url).fetch_rates()
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Набор из ~160 кодов валют, как в ответе api.exchangerate-api.com
+CURRENCIES = (
+    "AED AFN ALL AMD ANG AOA ARS AUD AWG AZN BAM BBD BDT BGN BHD BIF BMD BND BOB BRL BSD BTN BWP BYN BZD "
+    "CAD CDF CHF CLP CNY COP CRC CUP CVE CZK DJF DKK DOP DZD EGP ERN ETB EUR FJD FKP FOK GBP GEL GGP GHS "
+    "GIP GMD GNF GTQ GYD HKD HNL HRK HTG HUF IDR ILS IMP INR IQD IRR ISK JEP JMD JOD JPY KES KGS KHR KID "
+    "KMF KRW KWD KYD KZT LAK LBP LKR LRD LSL LYD MAD MDL MGA MKD MMK MNT MOP MRU MUR MVR MWK MXN MYR MZN "
+    "NAD NGN NIO NOK NPR NZD OMR PAB PEN PGK PHP PKR PLN PYG QAR RON RSD RUB RWF SAR SBD SCR SDG SEK SGD "
+    "SHP SLE SLL SOS SRD SSP STN SYP SZL THB TJS TMT TND TOP TRY TTD TVD TWD TZS UAH UGX USD UYU UZS VES "
+    "VND VUV WST XAF XCD XDR XOF XPF YER ZAR ZMW ZWL"
+).split()
+
+
+def sample_payload() -> dict:
+    """Ответ API с детерминированными курсами для всех валют из CURRENCIES."""
+    rates = {code: 1.0 if code == "USD" else round(0.5 + (i * 7.31) % 120, 4) for i, code in enumerate(CURRENCIES)}
+    rates.update({"RUB": 92.5, "EUR": 0.92, "GBP": 0.79, "CNY": 7.24})
+    return {"base": "USD", "date": "2024-01-01", "time_last_updated": 1704067200, "rates": rates}
+
+
+class StubRateServer:
+    """
+    HTTP-сервер с ответом в формате API курсов, работающий в фоновом потоке.
+
+    Args:
+        payload (dict, optional): Тело ответа (по умолчанию sample_payload()).
+        fail_first (int): Сколько первых запросов завершить ошибкой fail_status.
+        fail_status (int): HTTP-статус для неуспешных ответов.
+        etag (str, optional): ETag ответа; при совпадении If-None-Match возвращается 304.
+        delay (float): Задержка перед каждым ответом в секундах (имитация медленного источника).
+        retry_after (str, optional): Заголовок Retry-After для неуспешных ответов (например, с fail_status=429).
+    """
+    def __init__(self, payload=None, fail_first=0, fail_status=503, etag=None, delay=0.0,
+                 retry_after=None) -> None:
+        self.payload = payload or sample_payload()
+        self.delay = delay
+        self.retry_after = retry_after
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.etag = etag
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v4/latest/USD"
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    number = stub.requests
+                if stub.delay:
+                    time.sleep(stub.delay)
+                if number <= stub.fail_first:
+                    self._send(stub.fail_status, b"", stub.retry_after)
+                elif stub.etag and self.headers.get("If-None-Match") == stub.etag:
+                    self._send(304, b"")
+                else:
+                    self._send(200, json.dumps(stub.payload).encode())
+
+            def _send(self, status, body, retry_after=None):
+                self.send_response(status)
+                if retry_after:
+                    self.send_header("Retry-After", retry_after)
+                if stub.etag:
+                    self.send_header("ETag", stub.etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubRateServer":
+        # Короткий интервал опроса ускоряет stop() (по умолчанию shutdown ждет до 0,5 с)
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
\ No newline at end of file
@@ -1,11 +1,46 @@
 """
 Инициализационный файл пакета converters.
 Экспортирует классы для конвертации валют.
+
+Классы импортируются лениво (при первом обращении к атрибуту пакета),
+поэтому импорт пакета не загружает requests, NumPy и прочие зависимости.
 """
-from .currency_converter import CurrencyConverter
-from .usd_converter import UsdConverter
-from .usd_cny_converter import UsdCnyConverter
-from .usd_rub_converter import UsdRubConverter
-from .usd_eur_converter import UsdEurConverter
-from .usd_gbp_converter import UsdGbpConverter
-from .rate_fetcher import RateFetcher
\ No newline at end of file
+import importlib
+
+_EXPORTS = {
+    'CurrencyConverter': '.currency_converter',
+    'UsdConverter': '.usd_converter',
+    'UsdCnyConverter': '.usd_cny_converter',
+    'UsdRubConverter': '.usd_rub_converter',
+    'UsdEurConverter': '.usd_eur_converter',
+    'UsdGbpConverter': '.usd_gbp_converter',
+    'RateFetcher': '.rate_fetcher',
+    'AsyncRateFetcher': '.async_rate_fetcher',
+    'CrossRateConverter': '.cross_rate_converter',
+    'CrossRateMatrix': '.cross_rate_converter',
+    'HistoricalRateStore': '.rate_history',
+    'FixedPointConverter': '.fixed_point',
+    'RateCache': '.rate_cache',
+    'RateProvider': '.providers',
+    'ExchangeRateApiProvider': '.providers',
+    'OpenErApiProvider': '.providers',
+    'FrankfurterProvider': '.providers',
+    'ConversionServer': '.server',
+    'TokenBucket': '.quota',
+    'profiling': '.tracing',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Последующие обращения не проходят через __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
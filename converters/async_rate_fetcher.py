@@ -0,0 +1,178 @@
+import asyncio
+import json
+
+import requests
+
+from converters.circuit_breaker import backoff_delay
+from converters.metrics import metrics
+from converters.rate_fetcher import RateFetcher
+from converters.rate_snapshot import RateSnapshot
+
+
+class AsyncRateFetcher:
+    """
+    Асинхронный аналог RateFetcher для приложений на asyncio.
+
+    Никогда не блокирует цикл событий: HTTP-запросы и работа с кэш-файлом выполняются
+    в пуле потоков, а паузы между повторными попытками — через asyncio.sleep.
+    Если несколько корутин одновременно обнаруживают устаревший снимок, все они
+    ожидают один и тот же запрос (single-flight), а не выполняют каждая свой.
+
+    Снимок курсов, кэш-файл и настройки берутся из синхронного RateFetcher,
+    поэтому оба интерфейса видят одни и те же курсы.
+    """
+    def __init__(self, rate_fetcher=None) -> None:
+        """
+        Инициализация AsyncRateFetcher.
+
+        Args:
+            rate_fetcher (RateFetcher, optional): Экземпляр RateFetcher.
+                                                 Если None, используется Singleton RateFetcher.
+        """
+        self.rate_fetcher = rate_fetcher or RateFetcher()
+        self.logger = self.rate_fetcher.logger
+        self._inflight = None  # Текущая задача обновления курсов
+
+    async def fetch_rates(self) -> dict | None:
+        """
+        Получение обменных курсов из снимка в памяти, кэша или API.
+
+        Возвращает словарь с обменными курсами (только для чтения) или None в случае ошибки.
+        """
+        snapshot = await self.get_snapshot()
+        if snapshot is not None:
+            return snapshot.data
+        return None
+
+    async def get_rate(self, currency) -> float | None:
+        """
+        Получение курса USD к указанной валюте.
+
+        Args:
+            currency (str): Код валюты (например, 'EUR').
+
+        Returns:
+            float: Обменный курс или None, если курсы недоступны или валюта не найдена.
+        """
+        snapshot = await self.get_snapshot()
+        if snapshot is not None:
+            return snapshot.rates.get(currency)
+        return None
+
+    async def get_snapshot(self) -> RateSnapshot | None:
+        """
+        Получение текущего снимка курсов с той же семантикой, что и RateFetcher.get_snapshot.
+
+        Устаревший снимок в пределах stale_ttl возвращается сразу, а обновление
+        запускается в фоне; иначе вызывающий ожидает общий запрос обновления.
+        """
+        fetcher = self.rate_fetcher
+        snapshot = fetcher._snapshot
+        if snapshot is not None:
+            age = snapshot.age()
+            if age < fetcher.cache_expiry:
+                return snapshot
+            if age < fetcher.cache_expiry + fetcher.stale_ttl:
+                self._refresh_single_flight()
+                return snapshot
+            if fetcher.breaker.is_open():
+                return snapshot  # API недоступен: последние известные курсы без ожидания
+        return await asyncio.shield(self._refresh_single_flight())
+
+    def _refresh_single_flight(self) -> asyncio.Task:
+        """Возвращает текущую задачу обновления или создает новую, если ее нет."""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._refresh())
+        return self._inflight
+
+    async def _refresh(self) -> RateSnapshot | None:
+        """Обновление снимка из кэш-файла или API и уведомление подписчиков RateFetcher."""
+        snapshot = await self._refresh_snapshot()
+        self.rate_fetcher._announce()
+        return snapshot
+
+    async def _refresh_snapshot(self) -> RateSnapshot | None:
+        """Тело _refresh: загрузка снимка из кэш-файла или API."""
+        fetcher = self.rate_fetcher
+        snapshot = fetcher._snapshot
+        rates = await asyncio.to_thread(fetcher._load_newer_from_cache, snapshot)
+        if rates:
+            return fetcher._publish(rates)
+
+        locked = fetcher._lock_cache(blocking=False)
+        if locked is False:
+            # Курсы обновляет другой процесс: отдаем устаревшие данные или ждем его
+            stale = snapshot or await asyncio.to_thread(fetcher._load_stale_from_cache)
+            if stale is not None:
+                return stale
+            locked = await asyncio.to_thread(fetcher._lock_cache, True)
+        try:
+            rates = await asyncio.to_thread(fetcher._load_newer_from_cache, snapshot)
+            if not rates:
+                rates = await self._fetch_from_api()
+        finally:
+            if locked:
+                fetcher.cache.lock.release()
+        if not rates:
+            return await asyncio.to_thread(fetcher._serve_stale, snapshot)
+        return fetcher._publish(rates)
+
+    async def _allow_request(self) -> bool:
+        """
+        Проверка выключателя и квоты без блокировки цикла событий.
+
+        TokenBucket.acquire ожидает токен через time.sleep под файловой блокировкой,
+        поэтому при заданной квоте проверка выполняется в пуле потоков.
+        """
+        fetcher = self.rate_fetcher
+        if fetcher.quota is None:
+            return fetcher._allow_request()
+        return await asyncio.to_thread(fetcher._allow_request)
+
+    async def _fetch_from_api(self) -> dict | None:
+        """
+        Получение обменных курсов из API с повторными попытками без блокировки цикла событий.
+
+        Возвращает словарь с обменными курсами или None в случае ошибки.
+        """
+        fetcher = self.rate_fetcher
+        for attempt in range(fetcher.max_retries):
+            if not await self._allow_request():
+                return None
+            resolved = False  # См. RateFetcher._fetch_from_api
+            try:
+                self.logger.info(f"Fetching rates from API (async), attempt {attempt + 1}/{fetcher.max_retries}...")
+                rates = await asyncio.to_thread(fetcher._request_rates)
+                if rates is None:
+                    fetcher._record_failure()
+                    resolved = True
+                    if metrics.enabled:
+                        metrics.inc('rates_api_failures_total')
+                    return None
+                fetcher.breaker.record_success()
+                resolved = True
+                await asyncio.to_thread(fetcher._persist, rates)
+                self.logger.info("Rates fetched successfully from API.")
+                return rates
+
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"API request failed (attempt {attempt + 1}/{fetcher.max_retries}): {e}")
+                fetcher._record_failure()
+                resolved = True
+                if attempt < fetcher.max_retries - 1 and not fetcher.breaker.is_open():
+                    if metrics.enabled:
+                        metrics.inc('rates_api_retries_total')
+                    await asyncio.sleep(backoff_delay(fetcher.retry_delay, attempt))
+                else:
+                    if metrics.enabled:
+                        metrics.inc('rates_api_failures_total')
+                    self.logger.error("Max retries reached. Unable to fetch rates from API.")
+                    return None
+            except json.JSONDecodeError as e:
+                self.logger.error(f"Error decoding JSON response: {e}")
+                fetcher._record_failure()
+                resolved = True
+                return None
+            finally:
+                if not resolved:
+                    fetcher._record_failure()  # Непредвиденное исключение (или отмена) тоже считается неудачей
\ No newline at end of file
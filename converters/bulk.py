@@ -0,0 +1,199 @@
+"""
+Потоковая пакетная конвертация файлов CSV/JSONL.
+
+Входные данные читаются генераторами блоками фиксированного размера, поэтому
+объем используемой памяти не зависит от размера файла. Курсы запрашиваются
+один раз за запуск, а каждый блок конвертируется одним векторным проходом.
+"""
+import csv
+import json
+import math
+import sys
+import time
+from itertools import islice
+
+from converters.metrics import count_conversions
+from converters.rate_fetcher import RateFetcher
+from converters.tracing import traced, tracer
+from converters.vectorized import NAN, outer_multiply
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def detect_format(path) -> str:
+    """Определение формата по расширению файла: 'jsonl' для .jsonl/.ndjson, иначе 'csv'."""
+    if path and path.lower().endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return 'csv'
+
+
+def parse_amounts(lines, fmt='csv', column='amount'):
+    """
+    Генератор сумм из строк CSV или JSONL.
+
+    В CSV сумма берется из столбца column (если есть строка заголовка) или из первого столбца.
+    В JSONL каждая строка — либо число, либо объект с ключом column.
+
+    Args:
+        lines: Итерируемый объект строк (например, открытый файл).
+        fmt (str): 'csv' или 'jsonl'.
+        column (str): Имя столбца/ключа с суммой.
+
+    Raises:
+        ValueError: Если строка не содержит корректной суммы.
+    """
+    if fmt == 'jsonl':
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                yield float(record[column] if isinstance(record, dict) else record)
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Некорректная сумма в строке {line_number}: {e}") from e
+        return
+
+    reader = csv.reader(lines)
+    index = 0
+    for line_number, row in enumerate(reader, 1):
+        if not row:
+            continue
+        if line_number == 1 and column in row:
+            index = row.index(column)  # Строка заголовка
+            continue
+        try:
+            yield float(row[index])
+        except (IndexError, ValueError) as e:
+            raise ValueError(f"Некорректная сумма в строке {line_number}: {e}") from e
+
+
+def iter_chunks(values, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Генератор списков длиной не более chunk_size из итерируемого объекта."""
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def usd_column_rates(currencies, rate_fetcher=None) -> list | None:
+    """
+    Курсы USD к каждой из валют, полученные из одного снимка курсов.
+
+    Returns:
+        list[float]: Курсы (NaN для неизвестных валют) или None, если курсы недоступны.
+    """
+    snapshot = (rate_fetcher or RateFetcher()).get_snapshot()
+    if snapshot is None:
+        return None
+    rates = snapshot.rates
+    return [1.0 if currency == 'USD' else rates.get(currency, NAN) for currency in currencies]
+
+
+def convert_chunks(chunks, column_rates):
+    """
+    Генератор пар (суммы, матрица результатов) для каждого блока сумм.
+
+    Args:
+        chunks: Итерируемый объект блоков сумм в USD.
+        column_rates (list[float]): Курс для каждой валюты назначения.
+    """
+    chunks = iter(chunks)
+    while True:
+        with tracer.span('bulk.parse_chunk'):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        with tracer.span('bulk.convert_chunk', rows=len(chunk)):
+            result = outer_multiply(chunk, column_rates)
+        yield chunk, result
+
+
+def format_value(value) -> str:
+    """Форматирование результата конвертации (пустая строка для NaN)."""
+    return '' if math.isnan(value) else repr(value)
+
+
+def write_results(results, output, currencies, fmt='csv', header=True) -> int:
+    """
+    Инкрементальная запись результатов конвертации.
+
+    Args:
+        results: Итерируемый объект пар (суммы, матрица), см. convert_chunks.
+        output: Текстовый поток для записи.
+        currencies (list[str]): Коды валют (порядок столбцов).
+        fmt (str): 'csv' или 'jsonl'.
+        header (bool): Записывать ли строку заголовка CSV.
+
+    Returns:
+        int: Количество записанных строк.
+    """
+    rows = 0
+    if fmt == 'csv':
+        writer = csv.writer(output, lineterminator='\n')
+        if header:
+            writer.writerow(['amount', *currencies])
+    for amounts, matrix in results:
+        with tracer.span('bulk.write_chunk', rows=len(amounts)):
+            matrix = matrix.tolist() if hasattr(matrix, 'tolist') else matrix
+            if fmt == 'jsonl':
+                output.writelines(
+                    json.dumps({'amount': amount,
+                                **{currency: (None if math.isnan(value) else value)
+                                   for currency, value in zip(currencies, row)}}) + '\n'
+                    for amount, row in zip(amounts, matrix))
+            else:
+                writer.writerows([repr(amount), *map(format_value, row)] for amount, row in zip(amounts, matrix))
+        rows += len(amounts)
+    return rows
+
+
+@traced('bulk.convert')
+def bulk_convert(input_stream, output_stream, currencies, input_format='csv', output_format=None,
+                 column='amount', rate_fetcher=None, chunk_size=DEFAULT_CHUNK_SIZE) -> dict | None:
+    """
+    Потоковая конвертация сумм USD из входного потока в несколько валют.
+
+    Args:
+        input_stream: Текстовый поток CSV/JSONL с суммами в USD.
+        output_stream: Текстовый поток для результатов.
+        currencies (list[str]): Коды валют назначения.
+        input_format (str): Формат входных данных ('csv' или 'jsonl').
+        output_format (str, optional): Формат результатов; по умолчанию совпадает с входным.
+        column (str): Имя столбца/ключа с суммой.
+        rate_fetcher (RateFetcher, optional): Экземпляр RateFetcher.
+        chunk_size (int): Количество строк в одном блоке.
+
+    Returns:
+        dict: {'rows': количество строк, 'seconds': длительность, 'rows_per_sec': скорость}
+              или None, если курсы недоступны.
+
+    Raises:
+        ValueError: Если во входных данных встретилась некорректная сумма.
+    """
+    start = time.perf_counter()
+    column_rates = usd_column_rates(currencies, rate_fetcher)
+    if column_rates is None:
+        return None
+
+    chunks = iter_chunks(parse_amounts(input_stream, input_format, column), chunk_size)
+    rows = write_results(convert_chunks(chunks, column_rates), output_stream, currencies,
+                         output_format or input_format)
+    count_conversions(rows, currencies, column_rates)
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'seconds': seconds, 'rows_per_sec': rows / seconds if seconds > 0 else 0.0}
+
+
+def open_input(path):
+    """Открытие входного файла ('-' — стандартный ввод)."""
+    if path == '-':
+        return sys.stdin
+    return open(path, 'r', newline='', encoding='utf-8')
+
+
+def open_output(path):
+    """Открытие выходного файла ('-' или None — стандартный вывод)."""
+    if path in (None, '-'):
+        return sys.stdout
+    return open(path, 'w', newline='', encoding='utf-8')
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Автоматический выключатель (circuit breaker) для запросов к API курсов.
+
+После failure_threshold неудачных запросов подряд выключатель размыкается, и
+запросы не выполняются в течение периода охлаждения. Затем пропускается один
+пробный запрос: при успехе выключатель замыкается, при неудаче снова размыкается
+на вдвое больший период (экспоненциальная задержка со случайным разбросом,
+чтобы процессы и хосты не обращались к API одновременно).
+"""
+import random
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def backoff_delay(base, attempt, cap=60.0) -> float:
+    """
+    Пауза перед повторной попыткой: экспоненциальный рост со случайным разбросом.
+
+    Args:
+        base (float): Пауза перед первой повторной попыткой в секундах.
+        attempt (int): Номер неудачной попытки, начиная с 0.
+        cap (float): Максимальная пауза в секундах.
+
+    Returns:
+        float: Случайная пауза в диапазоне [delay / 2, delay], где delay = min(cap, base * 2**attempt).
+    """
+    delay = min(cap, base * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """
+    Потокобезопасный автоматический выключатель с состояниями closed, open и half_open.
+
+    Пока выключатель разомкнут, allow_request() возвращает False без обращения
+    к сети, поэтому во время недоступности API вызывающие получают ответ
+    (например, устаревшие курсы) за микросекунды.
+    """
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, max_reset_timeout=600.0) -> None:
+        """
+        Инициализация CircuitBreaker.
+
+        Args:
+            failure_threshold (int): Количество неудач подряд, после которого выключатель размыкается.
+            reset_timeout (float): Первый период охлаждения в секундах.
+            max_reset_timeout (float): Максимальный период охлаждения в секундах.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = CLOSED
+        self.failures = 0        # Неудачи подряд в замкнутом состоянии
+        self.trips = 0           # Размыкания подряд (определяет период охлаждения)
+        self.opened_at = None
+        self.retry_at = 0.0      # Момент, после которого разрешен пробный запрос
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Проверка, можно ли выполнить запрос.
+
+        После периода охлаждения разрешает ровно один пробный запрос (half_open);
+        остальные вызывающие получают False, пока не станет известен его результат.
+        """
+        if self.state == CLOSED:
+            return True
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() >= self.retry_at:
+                self.state = HALF_OPEN
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        """
+        Отказ от пробного запроса, разрешенного allow_request() (например, из-за исчерпанной квоты).
+
+        Выключатель возвращается в состояние open с прежним сроком, и следующий
+        вызов allow_request() снова разрешит пробный запрос.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = OPEN
+
+    def is_open(self) -> bool:
+        """True, если запросы сейчас блокируются (без изменения состояния)."""
+        state = self.state
+        if state == OPEN:
+            return time.monotonic() < self.retry_at
+        return state == HALF_OPEN
+
+    def retry_after(self) -> float:
+        """Количество секунд до следующего разрешенного запроса (0, если запросы разрешены)."""
+        if self.state == CLOSED:
+            return 0.0
+        return max(0.0, self.retry_at - time.monotonic())
+
+    def record_success(self) -> None:
+        """Учет успешного запроса: выключатель замыкается."""
+        if self.state == CLOSED and not self.failures:
+            return
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.trips = 0
+            self.opened_at = None
+
+    def record_failure(self) -> bool:
+        """
+        Учет неудачного запроса.
+
+        Returns:
+            bool: True, если выключатель разомкнулся в результате этой неудачи.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                return False  # Уже разомкнут (например, по Retry-After): срок не меняется
+            self.failures += 1
+            if self.state == CLOSED and self.failures < self.failure_threshold:
+                return False
+            timeout = min(self.max_reset_timeout, self.reset_timeout * 2 ** self.trips)
+            self.state = OPEN
+            self.trips += 1
+            self.failures = 0
+            self.opened_at = time.time()
+            self.retry_at = time.monotonic() + timeout / 2 + random.uniform(0, timeout / 2)
+            return True
+
+    def open_for(self, seconds) -> None:
+        """Размыкание выключателя не менее чем на seconds секунд (например, по заголовку Retry-After)."""
+        with self._lock:
+            if self.state != OPEN:
+                self.opened_at = time.time()
+            self.state = OPEN
+            self.failures = 0
+            self.retry_at = max(self.retry_at, time.monotonic() + seconds)
\ No newline at end of file
@@ -0,0 +1,255 @@
+import math
+import sys
+from array import array
+
+from converters.currency_converter import CurrencyConverter
+from converters.metrics import count_conversions, metrics
+from converters.rate_fetcher import RateFetcher
+from converters.tracing import traced, tracer
+from converters.vectorized import NAN, get_numpy, outer_multiply
+
+
+class CrossRateMatrix:
+    """
+    Предвычисленная матрица кросс-курсов N×N для всех валют из ответа API.
+
+    Строится один раз из курсов относительно USD: matrix[i][j] — количество единиц
+    валюты j за одну единицу валюты i. Значения хранятся в плоском массиве float64,
+    а коды валют интернированы, поэтому любой курс получается за O(1) без деления.
+    При изменении части курсов новая матрица строится через updated() пересчетом
+    только затронутых строк и столбцов.
+    """
+    __slots__ = ('currencies', 'index', 'size', 'usd', 'values')
+
+    def __init__(self, usd_rates) -> None:
+        """
+        Инициализация CrossRateMatrix.
+
+        Args:
+            usd_rates (dict): Курсы USD к другим валютам (поле 'rates' ответа API).
+        """
+        codes = sorted(set(usd_rates) | {'USD'})
+        self.currencies = tuple(sys.intern(code) for code in codes)
+        self.index = {code: i for i, code in enumerate(self.currencies)}
+        self.size = len(codes)
+
+        usd = [1.0 if code == 'USD' else float(usd_rates[code]) for code in codes]
+        self.usd = array('d', usd)
+        inverse = [1.0 / rate if rate else NAN for rate in usd]
+        np = get_numpy()
+        if np is not None:
+            self.values = array('d', np.multiply.outer(inverse, usd).ravel().tobytes())
+        else:
+            self.values = array('d', [inv * quote for inv in inverse for quote in usd])
+
+    def updated(self, usd_rates, changes) -> "CrossRateMatrix":
+        """
+        Новая матрица для курсов usd_rates, отличающихся от текущих только валютами changes.
+
+        Пересчитываются лишь строки и столбцы изменившихся валют (O(k·N) вместо O(N²));
+        если набор валют изменился, матрица строится заново. Текущая матрица не изменяется.
+
+        Args:
+            usd_rates (dict): Новые курсы USD к другим валютам.
+            changes (dict): Изменившиеся валюты (см. RateSnapshot.changes_since).
+
+        Returns:
+            CrossRateMatrix: Матрица для новых курсов.
+        """
+        if not changes:
+            return self  # Курсы не изменились (например, ответ 304): матрица та же
+        index = self.index
+        if any(old is None or new is None or code not in index for code, (old, new) in changes.items()):
+            return CrossRateMatrix(usd_rates)
+        matrix = object.__new__(CrossRateMatrix)
+        matrix.currencies = self.currencies
+        matrix.index = index
+        matrix.size = size = self.size
+        matrix.usd = usd = self.usd[:]
+        matrix.values = values = self.values[:]
+        changed = [index[code] for code in changes if code != 'USD']
+        for i in changed:
+            usd[i] = float(usd_rates[self.currencies[i]])
+
+        np = get_numpy()
+        if np is not None:
+            quotes = np.frombuffer(usd, dtype=np.float64)
+            with np.errstate(divide='ignore'):
+                inverse = np.where(quotes != 0, 1.0 / quotes, NAN)
+            grid = np.frombuffer(values, dtype=np.float64).reshape(size, size)
+            for i in changed:
+                grid[i, :] = inverse[i] * quotes
+                grid[:, i] = inverse * quotes[i]
+            return matrix
+
+        inverse = [1.0 / rate if rate else NAN for rate in usd]
+        for i in changed:
+            row = i * size
+            for j in range(size):
+                values[row + j] = inverse[i] * usd[j]
+                values[j * size + i] = inverse[j] * usd[i]
+        return matrix
+
+    def rate(self, from_currency, to_currency) -> float | None:
+        """
+        Кросс-курс для пары валют.
+
+        Args:
+            from_currency (str): Исходная валюта.
+            to_currency (str): Валюта назначения.
+
+        Returns:
+            float: Курс или None, если одна из валют неизвестна.
+        """
+        index = self.index
+        i = index.get(from_currency)
+        j = index.get(to_currency)
+        if i is None or j is None:
+            return None
+        rate = self.values[i * self.size + j]
+        return None if math.isnan(rate) else rate
+
+    def row(self, from_currency) -> memoryview | None:
+        """Курсы исходной валюты ко всем валютам (в порядке self.currencies) без копирования."""
+        i = self.index.get(from_currency)
+        if i is None:
+            return None
+        return memoryview(self.values)[i * self.size:(i + 1) * self.size]
+
+
+class CrossRateConverter(CurrencyConverter):
+    """
+    Универсальный конвертер между любыми валютами, которые возвращает API.
+
+    Кросс-курсы вычисляются один раз на снимок курсов RateFetcher и хранятся
+    в CrossRateMatrix. Конвертер подписан на изменения курсов: при публикации
+    нового снимка в матрице пересчитываются только изменившиеся валюты.
+    """
+    def __init__(self, rate_fetcher=None) -> None:
+        """
+        Инициализация CrossRateConverter.
+
+        Args:
+            rate_fetcher (RateFetcher, optional): Экземпляр RateFetcher.
+                                                 Если None, создается новый экземпляр.
+        """
+        self.rate_fetcher = rate_fetcher or RateFetcher()
+        self._snapshot = None
+        self._matrix = None
+        self.rate_fetcher.subscribe(self._on_rates_changed, weak=True)
+
+    def _on_rates_changed(self, changes, snapshot) -> None:
+        """Инкрементальное обновление матрицы при публикации нового снимка курсов."""
+        matrix, previous = self._matrix, self._snapshot
+        if matrix is None or previous is None:
+            return  # Матрица еще не строилась: будет построена при первом обращении
+        with tracer.span('cross.matrix_update'):
+            self._matrix = matrix.updated(snapshot.rates, snapshot.changes_since(previous))
+        self._snapshot = snapshot
+
+    def get_matrix(self) -> CrossRateMatrix | None:
+        """
+        Матрица кросс-курсов для текущего снимка курсов.
+
+        Возвращает CrossRateMatrix или None, если курсы недоступны.
+        """
+        return self.matrix_for(self.rate_fetcher.get_snapshot())
+
+    def matrix_for(self, snapshot) -> CrossRateMatrix | None:
+        """
+        Матрица кросс-курсов для указанного снимка курсов (без обращения к RateFetcher).
+
+        Используется, когда снимок уже получен иначе, например через AsyncRateFetcher.
+
+        Args:
+            snapshot (RateSnapshot | None): Снимок курсов.
+
+        Returns:
+            CrossRateMatrix или None, если снимок отсутствует.
+        """
+        if snapshot is None:
+            return None
+        if snapshot is not self._snapshot:
+            with tracer.span('cross.matrix_build'):
+                self._matrix = CrossRateMatrix(snapshot.rates)
+            self._snapshot = snapshot
+        return self._matrix
+
+    def get_exchange_rate(self, from_currency, to_currency) -> float | None:
+        """
+        Получение кросс-курса для пары валют.
+
+        Returns:
+            float: Курс или None, если курсы недоступны или валюта неизвестна.
+        """
+        matrix = self.get_matrix()
+        if matrix is None:
+            return None
+        return matrix.rate(from_currency, to_currency)
+
+    def convert(self, amount, from_currency, to_currency) -> float | None:
+        """
+        Конвертация суммы между произвольной парой валют.
+
+        Args:
+            amount (float): Сумма в исходной валюте.
+            from_currency (str): Код исходной валюты (например, 'EUR').
+            to_currency (str): Код валюты назначения (например, 'GBP').
+
+        Returns:
+            float: Сумма в валюте назначения или None, если курс недоступен.
+        """
+        rate = self.get_exchange_rate(from_currency, to_currency)
+        if rate is not None:
+            if metrics.enabled:
+                metrics.inc('conversions_total', currency=to_currency)
+            return amount * rate
+        return None
+
+    def convert_usd(self, amount, to_currency) -> float | None:
+        """
+        Конвертация USD в указанную валюту.
+
+        Args:
+            amount (float): Сумма в USD.
+            to_currency (str): Код валюты назначения.
+
+        Returns:
+            float: Сумма в указанной валюте или None, если курс недоступен.
+        """
+        return self.convert(amount, 'USD', to_currency)
+
+    @traced('convert.batch')
+    def convert_batch(self, amounts, from_currency, currencies, snapshot=None):
+        """
+        Векторизованная конвертация массива сумм из одной валюты в несколько валют.
+
+        Args:
+            amounts: Массив NumPy, буфер или последовательность сумм в исходной валюте.
+            from_currency (str): Код исходной валюты.
+            currencies (list[str]): Коды валют назначения.
+            snapshot (RateSnapshot, optional): Снимок курсов; если None, берется текущий
+                                               снимок RateFetcher (см. get_matrix).
+
+        Returns:
+            Матрица «суммы × валюты»; столбцы неизвестных валют заполнены NaN.
+        """
+        matrix = self.get_matrix() if snapshot is None else self.matrix_for(snapshot)
+        row = matrix.row(from_currency) if matrix is not None else None
+        if row is None:
+            column_rates = [NAN] * len(currencies)
+        else:
+            index = matrix.index
+            column_rates = [row[index[code]] if code in index else NAN for code in currencies]
+        result = outer_multiply(amounts, column_rates)
+        count_conversions(len(result), currencies, column_rates)
+        return result
+
+    def convert_usd_batch(self, amounts, currencies):
+        """
+        Векторизованная конвертация массива сумм USD в несколько валют.
+
+        Returns:
+            Матрица «суммы × валюты»; столбцы неизвестных валют заполнены NaN.
+        """
+        return self.convert_batch(amounts, 'USD', currencies)
\ No newline at end of file
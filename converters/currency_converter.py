@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from converters.vectorized import NAN, as_float_array
+
 class CurrencyConverter(ABC):
     """
     Абстрактный базовый класс для конвертеров валют.
@@ -17,4 +19,27 @@ class CurrencyConverter(ABC):
         Returns:
             float: Конвертированная сумма в указанной валюте или None в случае ошибки.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def convert_usd_batch(self, amounts, currencies):
+        """
+        Пакетная конвертация массива сумм USD сразу в несколько валют.
+
+        Базовая реализация вызывает convert_usd для каждой пары; подклассы
+        переопределяют метод векторизованной версией.
+
+        Args:
+            amounts: Массив NumPy, буфер или последовательность сумм в USD.
+            currencies (list[str]): Коды валют назначения.
+
+        Returns:
+            Матрица «суммы × валюты» (NaN там, где конвертация невозможна).
+        """
+        rows = []
+        for amount in as_float_array(amounts):
+            row = []
+            for currency in currencies:
+                value = self.convert_usd(amount, currency)
+                row.append(NAN if value is None else value)
+            rows.append(row)
+        return rows
\ No newline at end of file
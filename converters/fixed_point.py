@@ -0,0 +1,227 @@
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal
+
+from converters.currency_converter import CurrencyConverter
+from converters.metrics import metrics
+from converters.rate_fetcher import RateFetcher
+from converters.tracing import traced
+from converters.vectorized import get_numpy
+
+RATE_DECIMALS = 9  # Курсы хранятся как целые числа, умноженные на 10**RATE_DECIMALS
+DEFAULT_EXPONENT = 2
+INT64_MAX = 2 ** 63 - 1
+
+# Количество знаков дробной части (минорных единиц) по ISO 4217 для валют, где оно отличается от 2
+MINOR_UNIT_EXPONENTS = {
+    'BIF': 0, 'CLP': 0, 'DJF': 0, 'GNF': 0, 'ISK': 0, 'JPY': 0, 'KMF': 0, 'KRW': 0, 'PYG': 0,
+    'RWF': 0, 'UGX': 0, 'VND': 0, 'VUV': 0, 'XAF': 0, 'XOF': 0, 'XPF': 0,
+    'BHD': 3, 'IQD': 3, 'JOD': 3, 'KWD': 3, 'LYD': 3, 'OMR': 3, 'TND': 3,
+    'CLF': 4, 'UYW': 4,
+}
+
+ROUNDING_MODES = (ROUND_HALF_EVEN, ROUND_HALF_UP)
+
+
+def minor_unit_exponent(currency) -> int:
+    """Количество знаков минорных единиц валюты (2 для USD — центы, 0 для JPY)."""
+    return MINOR_UNIT_EXPONENTS.get(currency, DEFAULT_EXPONENT)
+
+
+def scale_rate(rate) -> int:
+    """Преобразование курса в целое число с RATE_DECIMALS знаками (точно, через десятичное представление)."""
+    return int(Decimal(str(rate)).scaleb(RATE_DECIMALS).to_integral_value(ROUND_HALF_EVEN))
+
+
+def divide_round(numerator, denominator, rounding=ROUND_HALF_EVEN):
+    """
+    Целочисленное деление с явным режимом округления.
+
+    Работает как с int, так и с целочисленными массивами NumPy (поэлементно).
+
+    Args:
+        numerator: Делимое (int или массив int64).
+        denominator (int): Положительный делитель.
+        rounding (str): ROUND_HALF_EVEN (банковское) или ROUND_HALF_UP (половина от нуля).
+
+    Returns:
+        Частное, округленное по выбранному правилу.
+    """
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Неподдерживаемый режим округления: {rounding}")
+    negative = numerator < 0
+    quotient, remainder = divmod(abs(numerator), denominator)
+    twice = remainder * 2
+    if rounding == ROUND_HALF_UP:
+        round_up = twice >= denominator
+    else:
+        round_up = (twice > denominator) | ((twice == denominator) & (quotient % 2 == 1))
+    return (quotient + round_up) * (1 - 2 * negative)
+
+
+def _convert_exact(amount_minor, scaled, shift, rounding) -> int:
+    """Конвертация суммы в целых числах Python (без ограничения разрядности)."""
+    product = amount_minor * scaled
+    if shift >= 0:
+        return product * 10 ** shift
+    return divide_round(product, 10 ** -shift, rounding)
+
+
+class FixedPointConverter(CurrencyConverter):
+    """
+    Точная конвертация в целых минорных единицах (центы, копейки, фэни).
+
+    Курсы хранятся как масштабированные целые числа, а результат округляется по
+    явно заданному правилу, поэтому итог совпадает с расчетом через Decimal, но
+    вычисляется целочисленной арифметикой (для массивов — в int64 средствами NumPy).
+    """
+    def __init__(self, rate_fetcher=None, rounding=ROUND_HALF_EVEN) -> None:
+        """
+        Инициализация FixedPointConverter.
+
+        Args:
+            rate_fetcher (RateFetcher, optional): Экземпляр RateFetcher.
+                                                 Если None, создается новый экземпляр.
+            rounding (str): Режим округления по умолчанию (ROUND_HALF_EVEN или ROUND_HALF_UP).
+        """
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"Неподдерживаемый режим округления: {rounding}")
+        self.rate_fetcher = rate_fetcher or RateFetcher()
+        self.rounding = rounding
+        self._snapshot = None
+        self._scaled_rates = {}
+        self.rate_fetcher.subscribe(self._on_rates_changed, weak=True)
+
+    def _on_rates_changed(self, changes, snapshot) -> None:
+        """Сброс масштабированных курсов только для изменившихся валют."""
+        previous = self._snapshot
+        if previous is None:
+            return
+        changed = snapshot.changes_since(previous)
+        if changed:
+            self._scaled_rates = {code: scaled for code, scaled in self._scaled_rates.items() if code not in changed}
+        self._snapshot = snapshot
+
+    def get_scaled_rate(self, currency) -> int | None:
+        """
+        Курс USD к указанной валюте в виде целого числа (курс * 10**RATE_DECIMALS).
+
+        Масштабированные курсы вычисляются один раз и сбрасываются только
+        для валют, курс которых изменился.
+        """
+        if currency == 'USD':
+            return 10 ** RATE_DECIMALS
+        snapshot = self.rate_fetcher.get_snapshot()
+        if snapshot is None:
+            return None
+        if snapshot is not self._snapshot:
+            self._scaled_rates = {}
+            self._snapshot = snapshot
+        scaled = self._scaled_rates.get(currency)
+        if scaled is None:
+            rate = snapshot.rates.get(currency)
+            if rate is None:
+                return None
+            scaled = self._scaled_rates[currency] = scale_rate(rate)
+        return scaled
+
+    @staticmethod
+    def _shift(to_currency) -> int:
+        """Степень десяти, на которую нужно умножить произведение суммы в центах USD и масштабированного курса."""
+        return minor_unit_exponent(to_currency) - minor_unit_exponent('USD') - RATE_DECIMALS
+
+    def convert_minor(self, amount_minor, to_currency, rounding=None) -> int | None:
+        """
+        Конвертация суммы в центах USD в минорные единицы валюты назначения.
+
+        Args:
+            amount_minor (int): Сумма в центах USD.
+            to_currency (str): Код валюты назначения.
+            rounding (str, optional): Режим округления; по умолчанию self.rounding.
+
+        Returns:
+            int: Сумма в минорных единицах валюты назначения или None, если курс недоступен.
+        """
+        scaled = self.get_scaled_rate(to_currency)
+        if scaled is None:
+            return None
+        if metrics.enabled:
+            metrics.inc('conversions_total', currency=to_currency)
+        return _convert_exact(int(amount_minor), scaled, self._shift(to_currency), rounding or self.rounding)
+
+    @traced('convert.minor_batch')
+    def convert_minor_batch(self, amounts_minor, to_currency, rounding=None):
+        """
+        Векторизованная конвертация массива сумм в центах USD.
+
+        Если установлен NumPy, расчет выполняется в int64: масштабированный курс
+        делится на старшую и младшую части, поэтому промежуточные значения не
+        превышают результат. Точно, в целых числах Python, пересчитываются только
+        строки, для которых и этого недостаточно (суммы порядка триллионов долларов).
+
+        Returns:
+            Массив int64 в минорных единицах валюты назначения (массив object,
+            если результат не помещается в int64; список int без NumPy)
+            либо None, если курс недоступен.
+        """
+        scaled = self.get_scaled_rate(to_currency)
+        if scaled is None:
+            return None
+        rounding = rounding or self.rounding
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"Неподдерживаемый режим округления: {rounding}")
+        shift = self._shift(to_currency)
+        if metrics.enabled:
+            metrics.inc('conversions_total', len(amounts_minor), currency=to_currency)
+
+        np = get_numpy()
+        if np is None:
+            return [_convert_exact(int(amount), scaled, shift, rounding) for amount in amounts_minor]
+
+        values = np.asarray(amounts_minor, dtype=np.int64).reshape(-1)
+        magnitude = np.abs(values)  # Для INT64_MIN остается отрицательным и считается переполнением
+        if shift >= 0:
+            factor = scaled * 10 ** shift
+            limit = INT64_MAX // factor
+            overflow = (magnitude < 0) | (magnitude > limit)
+            result = np.where(overflow, 0, magnitude) * np.int64(min(factor, INT64_MAX))
+        else:
+            # amount * scaled / divisor = (amount * high + amount * low / split) / (divisor / split)
+            divisor = 10 ** -shift
+            split = 10 ** min(-shift, len(str(scaled)) // 2)
+            high, low = divmod(scaled, split)
+            limit = min(INT64_MAX // max(split - 1, 1), INT64_MAX // (high + 1))
+            overflow = (magnitude < 0) | (magnitude > limit)
+            magnitude = np.where(overflow, 0, magnitude)
+            carry, tail = np.divmod(magnitude * np.int64(low), np.int64(split))
+            result, remainder = np.divmod(magnitude * np.int64(high) + carry, np.int64(divisor // split))
+            twice = (remainder * np.int64(split) + tail) * 2  # Удвоенный остаток от деления на divisor
+            if rounding == ROUND_HALF_UP:
+                result += twice >= divisor
+            else:
+                result += (twice > divisor) | ((twice == divisor) & (result % 2 == 1))
+        result = np.where(values < 0, -result, result)
+
+        if overflow.any():
+            rows = np.flatnonzero(overflow)
+            exact = [_convert_exact(int(values[i]), scaled, shift, rounding) for i in rows]
+            if any(not -INT64_MAX - 1 <= amount <= INT64_MAX for amount in exact):
+                result = result.astype(object)
+            result[rows] = exact
+        return result
+
+    def convert_usd(self, amount, to_currency) -> Decimal | None:
+        """
+        Точная конвертация суммы в USD в указанную валюту.
+
+        Args:
+            amount (int | str | Decimal): Сумма в USD.
+            to_currency (str): Код валюты назначения.
+
+        Returns:
+            Decimal: Сумма в валюте назначения с точностью до минорной единицы
+                     или None, если курс недоступен.
+        """
+        cents = Decimal(str(amount)).scaleb(minor_unit_exponent('USD')).to_integral_value(self.rounding)
+        minor = self.convert_minor(int(cents), to_currency)
+        if minor is None:
+            return None
+        return Decimal(minor).scaleb(-minor_unit_exponent(to_currency))
\ No newline at end of file
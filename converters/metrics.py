@@ -0,0 +1,199 @@
+"""
+Метрики конвертации и получения курсов: счетчики, гистограммы задержек и вычисляемые показатели.
+
+По умолчанию сбор выключен: места вызова проверяют флаг metrics.enabled до
+любых вычислений, поэтому на горячем пути остается одна проверка атрибута.
+
+Пример:
+    from converters.metrics import metrics
+    metrics.enable()
+    ...
+    print(metrics.render_prometheus())
+"""
+import bisect
+import threading
+
+# Границы бакетов гистограмм задержек в секундах
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+GAUGE = 'gauge'
+
+# Описания метрик пакета для строк # HELP
+DESCRIPTIONS = {
+    'rates_cache_hits_total': 'Rate lookups served from a cache layer.',
+    'rates_cache_misses_total': 'Rate lookups that missed a cache layer.',
+    'rates_api_requests_total': 'Requests sent to the rate API by outcome.',
+    'rates_api_retries_total': 'Retried rate API requests.',
+    'rates_api_failures_total': 'Rate fetches that failed after all retries.',
+    'rates_api_hedged_requests_total': 'Hedged requests sent to a secondary rate provider.',
+    'rates_api_throttled_total': 'Rate API requests skipped because the shared quota was exhausted.',
+    'rates_api_short_circuits_total': 'Rate API requests skipped by the open circuit breaker.',
+    'rates_api_request_duration_seconds': 'Duration of a single rate API request.',
+    'rates_snapshot_age_seconds': 'Age of the in-memory rate snapshot.',
+    'conversions_total': 'Converted amounts by target currency.',
+    'server_batches_total': 'Micro-batches processed by the conversion server.',
+    'server_batched_conversions_total': 'Single conversions coalesced into micro-batches.',
+}
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик с выводом в текстовом формате Prometheus и подключаемыми обработчиками.
+
+    Обработчик (hook) — вызываемый объект hook(kind, name, value, labels), который
+    получает каждое событие, например для отправки в StatsD.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS) -> None:
+        """
+        Инициализация MetricsRegistry.
+
+        Args:
+            buckets (tuple[float]): Границы бакетов гистограмм в секундах.
+        """
+        self.enabled = False
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}    # (имя, метки) -> значение
+        self._histograms = {}  # (имя, метки) -> [счетчики бакетов, сумма, количество]
+        self._gauges = {}      # имя -> функция, возвращающая значение или None
+        self._hooks = []
+
+    def enable(self) -> None:
+        """Включение сбора метрик."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Выключение сбора метрик (накопленные значения сохраняются)."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Сброс накопленных значений счетчиков и гистограмм."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def add_hook(self, hook) -> None:
+        """Подключение обработчика событий hook(kind, name, value, labels)."""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook) -> None:
+        """Отключение обработчика событий."""
+        self._hooks.remove(hook)
+
+    def register_gauge(self, name, callback) -> None:
+        """
+        Регистрация вычисляемого показателя.
+
+        Args:
+            name (str): Имя метрики.
+            callback: Функция без аргументов, возвращающая текущее значение или None.
+        """
+        self._gauges[name] = callback
+
+    def inc(self, name, value=1, **labels) -> None:
+        """Увеличение счетчика name с метками labels на value."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        for hook in self._hooks:
+            hook(COUNTER, name, value, labels)
+
+    def observe(self, name, value, **labels) -> None:
+        """Добавление наблюдения value (например, длительности в секундах) в гистограмму name."""
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+        for hook in self._hooks:
+            hook(HISTOGRAM, name, value, labels)
+
+    def value(self, name, **labels):
+        """Текущее значение счетчика (0, если событий не было)."""
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def render_prometheus(self) -> str:
+        """Все метрики в текстовом формате Prometheus (exposition format 0.0.4)."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(counts), total, count) for key, (counts, total, count) in self._histograms.items()}
+
+        lines = []
+        described = set()
+
+        def describe(name, kind):
+            if name in described:
+                return
+            described.add(name)
+            help_text = DESCRIPTIONS.get(name)
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in sorted(counters.items()):
+            describe(name, COUNTER)
+            lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+
+        for (name, labels), (counts, total, count) in sorted(histograms.items()):
+            describe(name, HISTOGRAM)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else _format_number(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        for name, callback in sorted(self._gauges.items()):
+            value = callback()
+            if value is None:
+                continue
+            describe(name, GAUGE)
+            lines.append(f"{name} {_format_number(value)}")
+
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels) -> str:
+    """Метки в формате Prometheus: {key="value",...}."""
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _format_number(value) -> str:
+    """Число в формате Prometheus."""
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+metrics = MetricsRegistry()  # Реестр метрик пакета
+
+
+def count_conversions(rows, currencies, column_rates) -> None:
+    """
+    Учет пакетной конвертации в conversions_total: по числу строк для каждой валюты с известным курсом.
+
+    Args:
+        rows (int): Количество сконвертированных сумм.
+        currencies (list[str]): Коды валют столбцов.
+        column_rates (list[float]): Курсы столбцов (NaN — валюта не поддерживается).
+    """
+    if not metrics.enabled:
+        return
+    if not rows:
+        return
+    for currency, rate in zip(currencies, column_rates):
+        if rate == rate:  # NaN не равен сам себе
+            metrics.inc('conversions_total', rows, currency=currency)
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Многопроцессная пакетная конвертация больших файлов CSV/JSONL.
+
+Файл делится на диапазоны байтов, выровненные по границам строк, которые
+конвертируются в пуле процессов. Курсы публикуются один раз через
+multiprocessing.shared_memory, поэтому рабочие процессы не создают собственный
+RateFetcher и не обращаются ни к API, ни к кэш-файлу. Результаты записываются
+в порядке следования диапазонов в исходном файле. При включенной трассировке
+интервалы рабочих процессов возвращаются вместе с результатами и добавляются
+в tracer родителя.
+"""
+import csv
+import io
+import os
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from converters.bulk import convert_chunks, iter_chunks, parse_amounts, usd_column_rates, write_results
+from converters.metrics import count_conversions
+from converters.tracing import traced, tracer
+
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+
+_worker_rates = None  # Курсы, скопированные рабочим процессом из общей памяти
+
+
+def split_byte_ranges(path, start, chunk_bytes=DEFAULT_CHUNK_BYTES) -> list:
+    """
+    Разбиение файла на диапазоны байтов, выровненные по границам строк.
+
+    Args:
+        path (str): Путь к файлу.
+        start (int): Смещение, с которого начинаются данные (после заголовка).
+        chunk_bytes (int): Примерный размер одного диапазона.
+
+    Returns:
+        list[tuple[int, int]]: Диапазоны (начало, конец).
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()  # Дочитываем до конца текущей строки
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def read_header(path, fmt, column) -> tuple:
+    """
+    Чтение строки заголовка CSV.
+
+    Returns:
+        tuple[str | None, int]: Строка заголовка (или None) и смещение начала данных.
+    """
+    if fmt != 'csv':
+        return None, 0
+    with open(path, 'rb') as f:
+        line = f.readline()
+    text = line.decode('utf-8')
+    row = next(csv.reader([text]), [])
+    if column in row:
+        return text, len(line)
+    return None, 0
+
+
+def _init_worker(shm_name, count, trace=False) -> None:
+    """
+    Инициализация рабочего процесса: однократное чтение курсов из общей памяти.
+
+    Args:
+        shm_name (str): Имя блока общей памяти с курсами.
+        count (int): Количество курсов.
+        trace (bool): Включить трассировку в рабочем процессе.
+    """
+    global _worker_rates
+    if trace:
+        tracer.enable()
+    else:
+        tracer.disable()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _worker_rates = list(array('d', bytes(shm.buf[:count * 8])))
+    finally:
+        shm.close()
+
+
+def _convert_range(path, start, end, header, input_format, output_format, column, currencies, chunk_size) -> tuple:
+    """
+    Конвертация одного диапазона байтов в рабочем процессе.
+
+    Returns:
+        tuple[str, int, list]: Отформатированные результаты, количество строк
+                               и интервалы трассировки (пустой список, если она выключена).
+    """
+    with tracer.span('parallel.convert_range', start=start, end=end) as span:
+        with open(path, 'rb') as f:
+            f.seek(start)
+            lines = f.read(end - start).decode('utf-8').splitlines(keepends=True)
+        if header is not None:
+            lines.insert(0, header)
+
+        output = io.StringIO()
+        chunks = iter_chunks(parse_amounts(lines, input_format, column), chunk_size)
+        rows = write_results(convert_chunks(chunks, _worker_rates), output, currencies, output_format, header=False)
+        span.set(rows=rows)
+    return output.getvalue(), rows, tracer.drain()
+
+
+def _write_range(future, output_stream) -> int:
+    """Запись результата диапазона и перенос его интервалов трассировки в tracer родителя."""
+    text, rows, events = future.result()
+    output_stream.write(text)
+    if events:
+        tracer.extend(events)
+    return rows
+
+
+@traced('parallel.convert')
+def parallel_bulk_convert(input_path, output_stream, currencies, input_format='csv', output_format=None,
+                          column='amount', rate_fetcher=None, workers=None, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                          chunk_size=65536) -> dict | None:
+    """
+    Многопроцессная конвертация файла сумм USD в несколько валют.
+
+    Args:
+        input_path (str): Путь к файлу CSV/JSONL (стандартный ввод не поддерживается).
+        output_stream: Текстовый поток для результатов.
+        currencies (list[str]): Коды валют назначения.
+        input_format (str): Формат входных данных ('csv' или 'jsonl').
+        output_format (str, optional): Формат результатов; по умолчанию совпадает с входным.
+        column (str): Имя столбца/ключа с суммой.
+        rate_fetcher (RateFetcher, optional): Экземпляр RateFetcher.
+        workers (int, optional): Количество процессов (по умолчанию — число ядер).
+        chunk_bytes (int): Примерный размер диапазона байтов для одной задачи.
+        chunk_size (int): Количество строк, конвертируемых за один векторный проход.
+
+    Returns:
+        dict: {'rows': количество строк, 'seconds': длительность, 'rows_per_sec': скорость}
+              или None, если курсы недоступны.
+
+    Raises:
+        ValueError: Если во входных данных встретилась некорректная сумма.
+    """
+    start = time.perf_counter()
+    output_format = output_format or input_format
+    column_rates = usd_column_rates(currencies, rate_fetcher)
+    if column_rates is None:
+        return None
+
+    workers = workers or os.cpu_count() or 1
+    header, data_start = read_header(input_path, input_format, column)
+    ranges = split_byte_ranges(input_path, data_start, chunk_bytes)
+
+    if output_format == 'csv':
+        csv.writer(output_stream, lineterminator='\n').writerow(['amount', *currencies])
+
+    rates = array('d', column_rates)
+    shm = shared_memory.SharedMemory(create=True, size=max(len(rates) * rates.itemsize, 1))
+    rows = 0
+    try:
+        shm.buf[:len(rates) * rates.itemsize] = rates.tobytes()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, len(rates), tracer.enabled)) as pool:
+            pending = deque()
+            for byte_range in ranges:
+                pending.append(pool.submit(_convert_range, input_path, *byte_range, header, input_format,
+                                           output_format, column, currencies, chunk_size))
+                # Ограничиваем число незаписанных результатов, чтобы память не росла с размером файла
+                if len(pending) >= 2 * workers:
+                    rows += _write_range(pending.popleft(), output_stream)
+            while pending:
+                rows += _write_range(pending.popleft(), output_stream)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    count_conversions(rows, currencies, column_rates)  # Рабочие процессы не разделяют реестр метрик
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'seconds': seconds, 'rows_per_sec': rows / seconds if seconds > 0 else 0.0}
\ No newline at end of file
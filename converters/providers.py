@@ -0,0 +1,182 @@
+"""
+Адаптеры источников обменных курсов.
+
+Каждый адаптер знает URL своего API и приводит ответ к единому виду,
+который использует RateFetcher:
+
+    {'base': 'USD', 'date': '2024-01-01', 'time_last_updated': 1704067200,
+     'provider': 'exchangerate-api', 'rates': {'USD': 1.0, 'EUR': 0.92, ...}}
+
+Курсы всегда указываются относительно USD; если API возвращает курсы
+к другой базовой валюте, адаптер пересчитывает их.
+"""
+import calendar
+import math
+import time
+from abc import ABC, abstractmethod
+
+
+def parse_rates(rates) -> dict | None:
+    """
+    Проверка курсов из ответа API.
+
+    Args:
+        rates: Значение поля 'rates' ответа.
+
+    Returns:
+        dict: Курсы в виде float или None, если rates — не словарь или хотя бы
+              один курс не является конечным числом (null, строка, NaN).
+    """
+    if not isinstance(rates, dict):
+        return None
+    parsed = {}
+    for code, rate in rates.items():
+        if isinstance(rate, bool) or not isinstance(rate, (int, float)) or not math.isfinite(rate):
+            return None
+        parsed[code] = float(rate)
+    return parsed
+
+
+def rebase_to_usd(rates, base) -> dict | None:
+    """
+    Пересчет курсов к базовой валюте USD.
+
+    Args:
+        rates (dict): Курсы относительно base (без самой base или с ней).
+        base (str): Код базовой валюты ответа API.
+
+    Returns:
+        dict: Курсы относительно USD (с 'USD': 1.0) или None, если курс USD
+              отсутствует или курсы некорректны (см. parse_rates).
+    """
+    rates = parse_rates(rates)
+    if rates is None or not isinstance(base, str):
+        return None
+    rates[base] = 1.0
+    usd = rates.get('USD')
+    if not usd:
+        return None
+    if base == 'USD':
+        return rates
+    return {code: rate / usd for code, rate in rates.items()}
+
+
+def date_to_timestamp(date) -> int | None:
+    """Unix-время начала дня для даты 'YYYY-MM-DD' (UTC) или None, если дата некорректна."""
+    try:
+        return calendar.timegm(time.strptime(date, '%Y-%m-%d'))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateProvider(ABC):
+    """
+    Абстрактный адаптер API обменных курсов.
+
+    Подклассы задают name, default_url и реализуют normalize для формата ответа своего API.
+    """
+    name = None         # Имя источника в логах, метриках и кэше
+    default_url = None  # URL API по умолчанию
+
+    def __init__(self, url=None, name=None, timeout=10) -> None:
+        """
+        Инициализация RateProvider.
+
+        Args:
+            url (str, optional): URL API; по умолчанию default_url.
+            name (str, optional): Имя источника; по умолчанию имя класса-адаптера.
+            timeout (float): Таймаут одного запроса в секундах.
+        """
+        self.url = url or self.default_url
+        self.name = name or self.name
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(url={self.url!r}, name={self.name!r})"
+
+    def request(self, session, headers=None):
+        """
+        Отправка запроса к API.
+
+        Args:
+            session (requests.Session): HTTP-сессия RateFetcher.
+            headers (dict, optional): Дополнительные заголовки (условные запросы).
+
+        Returns:
+            requests.Response: Ответ API.
+        """
+        return session.get(self.url, headers=headers, timeout=self.timeout)
+
+    @abstractmethod
+    def normalize(self, payload) -> dict | None:
+        """
+        Приведение ответа API к единому виду (см. описание модуля).
+
+        Args:
+            payload: Разобранный JSON-ответ (не обязательно словарь).
+
+        Returns:
+            dict: Данные с ключом 'rates' или None, если ответ не содержит корректных курсов.
+        """
+        pass
+
+
+class ExchangeRateApiProvider(RateProvider):
+    """Адаптер api.exchangerate-api.com (v4): {'base', 'date', 'time_last_updated', 'rates'}."""
+    name = 'exchangerate-api'
+    default_url = "https://api.exchangerate-api.com/v4/latest/USD"
+
+    def normalize(self, payload) -> dict | None:
+        if not isinstance(payload, dict) or not isinstance(payload.get('rates'), dict):
+            return None
+        rates = payload['rates']
+        base = payload.get('base', 'USD')
+        data = {key: value for key, value in payload.items() if key not in ('rates', 'timestamp')}
+        data['base'] = 'USD'
+        data['rates'] = rebase_to_usd(rates, base)
+        return data if data['rates'] else None
+
+
+class OpenErApiProvider(RateProvider):
+    """Адаптер open.er-api.com (v6): {'result', 'base_code', 'time_last_update_unix', 'rates'}."""
+    name = 'open-er-api'
+    default_url = "https://open.er-api.com/v6/latest/USD"
+
+    def normalize(self, payload) -> dict | None:
+        if not isinstance(payload, dict) or payload.get('result', 'success') != 'success':
+            return None
+        rates = rebase_to_usd(payload.get('rates'), payload.get('base_code', 'USD'))
+        if not rates:
+            return None
+        updated = payload.get('time_last_update_unix')
+        if isinstance(updated, bool) or not isinstance(updated, (int, float)):
+            updated = None
+        return {
+            'base': 'USD',
+            'date': time.strftime('%Y-%m-%d', time.gmtime(updated)) if updated else None,
+            'time_last_updated': updated,
+            'rates': rates,
+        }
+
+
+class FrankfurterProvider(RateProvider):
+    """Адаптер api.frankfurter.app (курсы ЕЦБ): {'amount', 'base', 'date', 'rates'} без базовой валюты в rates."""
+    name = 'frankfurter'
+    default_url = "https://api.frankfurter.app/latest?from=USD"
+
+    def normalize(self, payload) -> dict | None:
+        if not isinstance(payload, dict):
+            return None
+        rates = parse_rates(payload.get('rates'))
+        amount = payload.get('amount') or 1
+        if rates is None or isinstance(amount, bool) or not isinstance(amount, (int, float)):
+            return None
+        rates = rebase_to_usd({code: rate / amount for code, rate in rates.items()}, payload.get('base', 'USD'))
+        if not rates:
+            return None
+        return {
+            'base': 'USD',
+            'date': payload.get('date'),
+            'time_last_updated': date_to_timestamp(payload.get('date')),
+            'rates': rates,
+        }
\ No newline at end of file
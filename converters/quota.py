@@ -0,0 +1,155 @@
+"""
+Квота запросов к API курсов, общая для всех процессов хоста (token bucket).
+
+Состояние корзины хранится в маленьком файле и изменяется под межпроцессной
+блокировкой (FileLock), поэтому десятки рабочих процессов, запущенных
+одновременно, в сумме не превышают лимит API. Ответ 429 с Retry-After
+блокирует запросы всех процессов до указанного момента.
+
+Пример:
+    quota = TokenBucket("exchange_rates.quota", rate=10 / 60, capacity=5)
+    RateFetcher(quota=quota)
+"""
+import email.utils
+import os
+import struct
+import time
+
+from converters.rate_cache import FileLock
+
+PRIORITY_NORMAL = 0  # Досрочное обновление: только токены сверх резерва
+PRIORITY_HIGH = 1    # Курсы истекли или отсутствуют: можно использовать резерв
+
+# Количество токенов, время последнего пополнения, запрет запросов до (Unix-время)
+_STATE = struct.Struct('<ddd')
+
+
+def parse_retry_after(value, now=None) -> float | None:
+    """
+    Разбор заголовка Retry-After.
+
+    Args:
+        value (str): Значение заголовка: число секунд или HTTP-дата.
+        now (float, optional): Текущее Unix-время.
+
+    Returns:
+        float: Количество секунд ожидания или None, если заголовок отсутствует или некорректен.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, moment.timestamp() - (time.time() if now is None else now))
+
+
+class TokenBucket:
+    """
+    Межпроцессная корзина токенов для ограничения частоты запросов к API.
+
+    Токены пополняются со скоростью rate в секунду до capacity. Запросы
+    с обычным приоритетом не расходуют последние reserve токенов, оставляя их
+    обновлениям, без которых вызывающим нечего вернуть (истекшие курсы).
+    """
+    def __init__(self, path="exchange_rates.quota", rate=1.0, capacity=5, reserve=1) -> None:
+        """
+        Инициализация TokenBucket.
+
+        Args:
+            path (str): Путь к файлу состояния. Рядом создается файл блокировки path + '.lock'.
+            rate (float): Скорость пополнения, токенов в секунду (например, 100 / 3600 для 100 запросов в час).
+            capacity (int): Максимальное количество токенов (допустимый всплеск запросов).
+            reserve (int): Количество токенов, доступных только запросам с PRIORITY_HIGH.
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate должен быть положительным, а capacity — не меньше 1.")
+        self.path = path
+        self.rate = rate
+        self.capacity = capacity
+        self.reserve = min(reserve, capacity - 1)
+        self.lock = FileLock(path + '.lock')
+
+    def _read(self, fd, now) -> tuple:
+        """Чтение состояния (новая корзина заполнена полностью)."""
+        os.lseek(fd, 0, os.SEEK_SET)
+        raw = os.read(fd, _STATE.size)
+        if len(raw) != _STATE.size:
+            return float(self.capacity), now, 0.0
+        tokens, updated, blocked_until = _STATE.unpack(raw)
+        # Пополнение за прошедшее время (при переводе часов назад — без пополнения)
+        tokens = min(float(self.capacity), tokens + max(0.0, now - updated) * self.rate)
+        return tokens, now, blocked_until
+
+    def _update(self, change):
+        """
+        Атомарное изменение состояния: change(tokens, blocked_until, now) -> (tokens, blocked_until, result).
+        """
+        with self.lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                now = time.time()
+                tokens, updated, blocked_until = self._read(fd, now)
+                tokens, blocked_until, result = change(tokens, blocked_until, now)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, _STATE.pack(tokens, updated, blocked_until))
+            finally:
+                os.close(fd)
+        return result
+
+    def try_acquire(self, priority=PRIORITY_NORMAL) -> float:
+        """
+        Попытка взять один токен без ожидания.
+
+        Args:
+            priority (int): PRIORITY_NORMAL или PRIORITY_HIGH.
+
+        Returns:
+            float: 0, если токен получен, иначе количество секунд до момента, когда он появится.
+        """
+        needed = 1.0 if priority >= PRIORITY_HIGH else 1.0 + self.reserve
+
+        def take(tokens, blocked_until, now):
+            if now < blocked_until:
+                return tokens, blocked_until, blocked_until - now
+            if tokens >= needed:
+                return tokens - 1.0, blocked_until, 0.0
+            return tokens, blocked_until, (needed - tokens) / self.rate
+
+        return self._update(take)
+
+    def acquire(self, priority=PRIORITY_NORMAL, timeout=0.0) -> bool:
+        """
+        Получение токена с ожиданием не дольше timeout секунд.
+
+        Returns:
+            bool: True, если токен получен.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(priority)
+            if wait == 0:
+                return True
+            remaining = deadline - time.monotonic()
+            if wait > remaining:
+                return False
+            time.sleep(wait)
+
+    def block_for(self, seconds) -> None:
+        """Запрет запросов всех процессов на seconds секунд (например, по Retry-After)."""
+        def block(tokens, blocked_until, now):
+            return 0.0, max(blocked_until, now + seconds), None
+
+        self._update(block)
+
+    def retry_after(self) -> float:
+        """Количество секунд до момента, когда будет доступен токен обычного приоритета."""
+        def peek(tokens, blocked_until, now):
+            if now < blocked_until:
+                return tokens, blocked_until, blocked_until - now
+            return tokens, blocked_until, max(0.0, (1.0 + self.reserve - tokens) / self.rate)
+
+        return self._update(peek)
\ No newline at end of file
@@ -0,0 +1,202 @@
+import errno
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+from array import array
+
+from converters.tracing import traced
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+MAGIC = b'RCCH'
+VERSION = 2  # 2: в заголовок добавлена длина метаданных
+# Сигнатура, версия, timestamp, длина метаданных, длина списка кодов, число валют
+_HEADER = struct.Struct('<4sHdIII')
+
+
+class FileLock:
+    """
+    Межпроцессная блокировка на основе файла (flock в POSIX, msvcrt.locking в Windows).
+
+    Дополнительно защищена блокировкой потоков, так как файловые блокировки
+    не разделяют потоки одного процесса.
+    """
+    def __init__(self, path) -> None:
+        """
+        Инициализация FileLock.
+
+        Args:
+            path (str): Путь к файлу блокировки (создается при необходимости).
+        """
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._fd = None
+
+    def acquire(self, blocking=True) -> bool:
+        """
+        Захват блокировки.
+
+        Args:
+            blocking (bool): Ждать освобождения блокировки другим процессом.
+
+        Returns:
+            bool: True, если блокировка захвачена; False, если blocking=False и
+                  блокировку держит другой поток или процесс.
+
+        Raises:
+            OSError: Если файл блокировки не удалось открыть или заблокировать
+                     (например, каталог не существует или недоступен для записи).
+        """
+        if not self._thread_lock.acquire(blocking):
+            return False
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            except BaseException:
+                os.close(fd)
+                raise
+        except OSError as e:
+            self._thread_lock.release()
+            if not blocking and e.errno in (errno.EAGAIN, errno.EACCES, errno.EWOULDBLOCK):
+                return False  # Блокировку держит другой процесс
+            raise
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """
+        Освобождение блокировки.
+
+        Raises:
+            RuntimeError: Если блокировка не захвачена.
+        """
+        fd, self._fd = self._fd, None
+        if fd is None:
+            raise RuntimeError("FileLock.release() вызван без захвата блокировки.")
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
+
+
+class RateCache:
+    """
+    Файловый кэш обменных курсов, общий для всех процессов на хосте.
+
+    Курсы хранятся в компактном бинарном формате: заголовок, метаданные ответа API
+    в JSON (base, date и т.п.), коды валют через запятую и массив курсов float64. Такой файл
+    загружается значительно быстрее, чем JSON со всеми курсами. Запись атомарна
+    (временный файл + переименование), поэтому читатели никогда не видят
+    частично записанный файл, а блокировка lock позволяет только одному процессу
+    обновлять курсы, пока остальные ждут или используют устаревшие данные.
+    """
+    def __init__(self, path="exchange_rates.cache") -> None:
+        """
+        Инициализация RateCache.
+
+        Args:
+            path (str): Путь к файлу кэша. Рядом создается файл блокировки path + '.lock'.
+        """
+        self.path = path
+        self.lock = FileLock(path + '.lock')
+        self.logger = logging.getLogger(__name__)
+
+    @traced('cache.load')
+    def load(self) -> dict | None:
+        """
+        Загрузка курсов из файла кэша (без проверки срока жизни).
+
+        Returns:
+            dict: Данные с ключами 'rates' и 'timestamp' (и метаданными ответа API)
+                  или None, если файла нет или он поврежден.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.logger.warning(f"Unable to read cache file: {e}")
+            return None
+
+        try:
+            magic, version, timestamp, meta_size, codes_size, count = _HEADER.unpack_from(raw)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("unknown cache format")
+            offset = _HEADER.size
+            data = json.loads(raw[offset:offset + meta_size]) if meta_size else {}
+            offset += meta_size
+            codes = raw[offset:offset + codes_size].decode('ascii').split(',') if count else []
+            offset += codes_size
+            values = array('d')
+            values.frombytes(raw[offset:offset + count * values.itemsize])
+            if len(values) != count or len(codes) != count:
+                raise ValueError("truncated cache file")
+        except (struct.error, ValueError) as e:
+            self.logger.warning(f"Invalid cache file or format ({e}). Fetching from API.")
+            return None
+
+        data['rates'] = dict(zip(codes, values.tolist()))
+        data['timestamp'] = timestamp
+        return data
+
+    @traced('cache.save')
+    def save(self, data) -> None:
+        """
+        Атомарное сохранение курсов в файл кэша.
+
+        Args:
+            data (dict): Данные с ключами 'rates' и 'timestamp'; остальные ключи
+                         сохраняются как метаданные.
+
+        Raises:
+            OSError: Если файл не удалось записать.
+            TypeError: Если метаданные не сериализуются в JSON.
+        """
+        rates = data['rates']
+        meta = json.dumps({key: value for key, value in data.items() if key not in ('rates', 'timestamp')},
+                          separators=(',', ':')).encode('utf-8')
+        codes = ','.join(rates).encode('ascii')
+        values = array('d', (float(rate) for rate in rates.values()))
+        payload = _HEADER.pack(MAGIC, VERSION, float(data['timestamp']), len(meta), len(codes), len(rates)) \
+            + meta + codes + values.tobytes()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix='.rates-', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(temp_path, 0o644)  # mkstemp создает файл, доступный только владельцу
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
\ No newline at end of file
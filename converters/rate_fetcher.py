@@ -1,8 +1,17 @@
-import requests
 import json
 import time
-import os
 import logging
+import threading
+import weakref
+
+from converters.circuit_breaker import CircuitBreaker, backoff_delay
+from converters.metrics import metrics
+from converters.providers import ExchangeRateApiProvider
+from converters.quota import PRIORITY_HIGH, PRIORITY_NORMAL, parse_retry_after
+from converters.rate_cache import RateCache
+from converters.rate_history import HistoricalRateStore
+from converters.rate_snapshot import RateSnapshot
+from converters.tracing import traced, tracer
 
 class RateFetcher:
     """
@@ -10,24 +19,75 @@ class RateFetcher:
 
     Гарантирует, что в приложении будет только один экземпляр для управления
     запросами к API и кэшированием.
+
+    Курсы хранятся в памяти процесса в виде неизменяемого снимка (RateSnapshot).
+    Кэш-файл читается только после истечения срока жизни снимка, а в течение
+    stale_ttl секунд после истечения вызывающим отдается устаревший снимок,
+    пока обновление выполняется в фоне (stale-while-revalidate).
+
+    Кэш-файл общий для всех процессов хоста (см. RateCache): курсы из API
+    запрашивает только процесс, захвативший блокировку кэша, а остальные
+    в это время используют устаревшие курсы или ждут результата.
+
+    Если API недоступен, автоматический выключатель (CircuitBreaker) после
+    failure_threshold неудач подряд прекращает запросы на период охлаждения,
+    а вызывающим отдаются последние полученные курсы; проверить их актуальность
+    можно через is_stale() и RateSnapshot.age().
+
+    Источники курсов задаются списком адаптеров providers (см. converters.providers);
+    по умолчанию используется один источник api_url. Если источников несколько,
+    запрос хеджируется: когда основной источник не ответил за hedge_delay секунд
+    (или ответил ошибкой), запрашивается следующий, и используется первый успешный ответ.
+
+    Частоту запросов к API всех процессов хоста можно ограничить общей квотой
+    quota (TokenBucket): обновления истекших курсов получают приоритет, а ответ
+    429 с заголовком Retry-After приостанавливает запросы всех процессов.
+
+    Подписчики (subscribe) получают уведомление при публикации нового снимка,
+    если изменились курсы интересующих их валют.
     """
     _instance = None  # Singleton instance
 
     def __new__(cls, api_url="https://api.exchangerate-api.com/v4/latest/USD",
-                cache_file="exchange_rates.json", cache_expiry=3600, max_retries=3, retry_delay=2) -> None:
+                cache_file="exchange_rates.cache", cache_expiry=3600, max_retries=3, retry_delay=2,
+                stale_ttl=600, history_file=None, failure_threshold=3, breaker_timeout=30,
+                providers=None, hedge_delay=0.5, quota=None, quota_timeout=10) -> None:
         if not cls._instance:
             cls._instance = super(RateFetcher, cls).__new__(cls)
              # Инициализация атрибутов только при первом создании экземпляра
             cls._instance.api_url = api_url
             cls._instance.cache_file = cache_file
+            cls._instance.cache = RateCache(cache_file)
             cls._instance.cache_expiry = cache_expiry
             cls._instance.max_retries = max_retries
             cls._instance.retry_delay = retry_delay
+            cls._instance.stale_ttl = stale_ttl
+            cls._instance.history = HistoricalRateStore(history_file) if history_file else None
+            cls._instance.breaker = CircuitBreaker(failure_threshold, breaker_timeout)
+            cls._instance.providers = list(providers) if providers else [ExchangeRateApiProvider(api_url)]
+            cls._instance.hedge_delay = hedge_delay
+            cls._instance._hedge_pool = None
+            cls._instance.quota = quota
+            cls._instance.quota_timeout = quota_timeout
+            cls._instance._subscribers = []  # (функция получения обработчика, валюты или None)
+            cls._instance._subscribers_lock = threading.Lock()
+            cls._instance._announced = None  # Последний снимок, о котором уведомлены подписчики
+            cls._instance._announce_lock = threading.RLock()
+            cls._instance._snapshot = None
+            cls._instance._refresh_lock = threading.Lock()
+            cls._instance._revalidate_lock = threading.Lock()
+            cls._instance._refresher = None
+            cls._instance._refresher_stop = threading.Event()
             cls._instance.logger = cls._instance._setup_logger()
+            cls._instance._session = None
+            cls._instance._session_lock = threading.Lock()
+            metrics.register_gauge('rates_snapshot_age_seconds', cls._instance.snapshot_age)
         return cls._instance
 
     def __init__(self, api_url="https://api.exchangerate-api.com/v4/latest/USD",
-                 cache_file="exchange_rates.json", cache_expiry=3600, max_retries=3, retry_delay=2) -> None:
+                 cache_file="exchange_rates.cache", cache_expiry=3600, max_retries=3, retry_delay=2,
+                 stale_ttl=600, history_file=None, failure_threshold=3, breaker_timeout=30,
+                 providers=None, hedge_delay=0.5, quota=None, quota_timeout=10) -> None:
         """
         Инициализация RateFetcher (вызывается только при первом создании экземпляра благодаря Singleton).
         Параметры задаются в __new__, этот метод в основном для совместимости и может быть пустым.
@@ -37,71 +97,594 @@ class RateFetcher:
     def _setup_logger(self) -> logging.Logger:
         """Настройка логгера."""
         logger = logging.getLogger(__name__)
-        logger.setLevel(logging.INFO)
-        ch = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        ch.setFormatter(formatter)
-        logger.addHandler(ch)
+        if not logger.handlers:  # Обработчик добавляется один раз на процесс
+            logger.setLevel(logging.INFO)
+            ch = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            ch.setFormatter(formatter)
+            logger.addHandler(ch)
         return logger
 
     def fetch_rates(self) -> dict:
         """
-        Получение обменных курсов из кэша или API.
+        Получение обменных курсов из снимка в памяти, кэша или API.
 
-        Возвращает словарь с обменными курсами или None в случае ошибки.
+        Возвращает словарь с обменными курсами (только для чтения) или None в случае ошибки.
         """
-        rates = self._load_from_cache()
+        snapshot = self.get_snapshot()
+        if snapshot is not None:
+            return snapshot.data
+        return None
+
+    def get_rate(self, currency) -> float | None:
+        """
+        Получение курса USD к указанной валюте из снимка в памяти.
+
+        Args:
+            currency (str): Код валюты (например, 'EUR').
+
+        Returns:
+            float: Обменный курс или None, если курсы недоступны или валюта не найдена.
+        """
+        snapshot = self.get_snapshot()
+        if snapshot is not None:
+            return snapshot.rates.get(currency)
+        return None
+
+    def is_stale(self, snapshot=None) -> bool:
+        """
+        Проверка, устарели ли курсы (снимок старше cache_expiry).
+
+        Устаревшие курсы отдаются, пока обновление выполняется в фоне или пока
+        API недоступен; их возраст в секундах возвращает snapshot.age().
+
+        Args:
+            snapshot (RateSnapshot, optional): Проверяемый снимок; по умолчанию текущий.
+
+        Returns:
+            bool: True, если снимок устарел или курсов нет.
+        """
+        snapshot = snapshot or self._snapshot
+        return snapshot is None or snapshot.age() >= self.cache_expiry
+
+    def get_snapshot(self) -> RateSnapshot | None:
+        """
+        Получение текущего снимка курсов.
+
+        Свежий снимок возвращается без обращения к диску. Истекший, но находящийся
+        в пределах stale_ttl снимок возвращается сразу, а обновление запускается в фоне.
+        Пока разомкнут автоматический выключатель, сразу возвращается последний
+        известный снимок, сколько бы он ни устарел.
+        В остальных случаях курсы синхронно загружаются из кэша или API.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            age = snapshot.age()
+            if age < self.cache_expiry:
+                if metrics.enabled:
+                    metrics.inc('rates_cache_hits_total', layer='memory')
+                return snapshot
+            if age < self.cache_expiry + self.stale_ttl:
+                if metrics.enabled:
+                    metrics.inc('rates_cache_hits_total', layer='memory_stale')
+                self._revalidate_in_background()
+                return snapshot
+            if self.breaker.is_open():
+                if metrics.enabled:
+                    metrics.inc('rates_cache_hits_total', layer='memory_stale')
+                return snapshot
+        if metrics.enabled:
+            metrics.inc('rates_cache_misses_total', layer='memory')
+        return self._refresh()
+
+    def snapshot_age(self) -> float | None:
+        """Возраст текущего снимка курсов в секундах или None, если снимка нет."""
+        snapshot = self._snapshot
+        return snapshot.age() if snapshot is not None else None
+
+    @traced('rates.refresh')
+    def _refresh(self, force=False) -> RateSnapshot | None:
+        """
+        Обновление снимка из кэш-файла или API (одновременно выполняется только одно обновление).
+
+        Args:
+            force (bool): Обновить, даже если текущий снимок еще не истек.
+        """
+        with self._refresh_lock:
+            snapshot = self._refresh_locked(force)
+        # Подписчики уведомляются вне блокировки: обработчик может сам вызывать get_rate
+        self._announce()
+        return snapshot
+
+    def _refresh_locked(self, force) -> RateSnapshot | None:
+        """Тело _refresh, выполняемое под _refresh_lock."""
+        snapshot = self._snapshot
+        if not force and snapshot is not None and snapshot.age() < self.cache_expiry:
+            return snapshot  # Снимок уже обновлен другим потоком
+
+        rates = self._load_newer_from_cache(snapshot)
         if rates:
-            return rates
+            return self._publish(rates)
+
+        locked = self._lock_cache(blocking=False)
+        if locked is False:
+            # Курсы обновляет другой процесс: отдаем устаревшие данные или ждем его
+            stale = snapshot or self._load_stale_from_cache()
+            if stale is not None:
+                return stale
+            locked = self._lock_cache(blocking=True)
+        try:
+            rates = self._load_newer_from_cache(snapshot) or self._fetch_from_api()
+        finally:
+            if locked:
+                self.cache.lock.release()
+        if not rates:
+            # API недоступен: отдаем последние известные курсы (см. is_stale)
+            return self._serve_stale(snapshot)
+        return self._publish(rates)
+
+    def _lock_cache(self, blocking) -> bool | None:
+        """
+        Захват межпроцессной блокировки кэш-файла.
+
+        Returns:
+            bool: True — блокировка захвачена, False — ее держит другой процесс;
+                  None — блокировку не удалось создать (например, каталог кэша
+                  недоступен), и курсы обновляются без нее.
+        """
+        try:
+            return self.cache.lock.acquire(blocking)
+        except OSError as e:
+            self.logger.warning(f"Unable to lock cache file ({e}); refreshing rates without the lock.")
+            return None
+
+    def _load_newer_from_cache(self, snapshot) -> dict | None:
+        """Загрузка курсов из кэш-файла, только если они новее текущего снимка."""
+        rates = self._load_from_cache()
+        if rates and snapshot is not None and rates['timestamp'] <= snapshot.timestamp:
+            return None  # На диске нет ничего новее текущего снимка
+        return rates
+
+    def _load_stale_from_cache(self) -> RateSnapshot | None:
+        """Публикация курсов из кэш-файла независимо от их срока жизни (если файл есть)."""
+        rates = self._load_from_cache(allow_stale=True)
+        if not rates:
+            return None
+        return self._publish(rates)
+
+    def _serve_stale(self, snapshot) -> RateSnapshot | None:
+        """Последние известные курсы (из памяти или кэш-файла) после неудачного обновления."""
+        stale = snapshot or self._load_stale_from_cache()
+        if stale is not None:
+            self.logger.warning(f"Serving stale rates (age {stale.age():.0f}s) while the rate API is unavailable.")
+        return stale
+
+    def _publish(self, rates) -> RateSnapshot:
+        """
+        Публикация новых курсов атомарной заменой ссылки на снимок.
+
+        Подписчики уведомляются отдельно (_announce) после снятия _refresh_lock.
+        """
+        snapshot = RateSnapshot(rates)
+        self._snapshot = snapshot
+        return snapshot
+
+    def _announce(self) -> None:
+        """
+        Уведомление подписчиков о текущем снимке, если о нем еще не сообщалось.
+
+        Изменения вычисляются относительно последнего объявленного снимка, поэтому
+        подписчики получают снимки по порядку, даже если их опубликовали разные потоки.
+        """
+        if self._snapshot is self._announced:
+            return
+        with self._announce_lock:
+            previous, snapshot = self._announced, self._snapshot
+            if snapshot is previous:
+                return
+            self._announced = snapshot
+            if self._subscribers:
+                self._notify(snapshot.changes_since(previous), snapshot)
+
+    def subscribe(self, callback, currencies=None, weak=False) -> None:
+        """
+        Подписка на изменения курсов.
+
+        Обработчик вызывается в потоке, опубликовавшем новый снимок: без фильтра
+        currencies — при каждом новом снимке (changes может быть пустым, например
+        после ответа 304), с фильтром — только если изменился курс хотя бы одной из
+        валют currencies. Курсы обновляются при обращении к устаревшему снимку или
+        фоновым потоком (start_background_refresh).
+
+        Args:
+            callback: Функция callback(changes, snapshot), где changes — словарь
+                      {код валюты: (старый курс, новый курс)} только для валют подписки,
+                      а snapshot — новый RateSnapshot.
+            currencies (Iterable[str], optional): Коды отслеживаемых валют; None — все валюты.
+            weak (bool): Хранить слабую ссылку на обработчик (подписка удаляется вместе
+                         с объектом, которому принадлежит метод).
+        """
+        if weak:
+            getter = weakref.WeakMethod(callback) if hasattr(callback, '__self__') else weakref.ref(callback)
+        else:
+            getter = lambda: callback
+        with self._subscribers_lock:
+            self._subscribers.append((getter, frozenset(currencies) if currencies is not None else None))
+
+    def unsubscribe(self, callback) -> None:
+        """Отмена подписки callback (если обработчик не подписан, ничего не происходит)."""
+        with self._subscribers_lock:
+            self._subscribers = [(getter, currencies) for getter, currencies in self._subscribers
+                                 if getter() not in (callback, None)]
+
+    def _notify(self, changes, snapshot) -> None:
+        """Уведомление подписчиков о новом снимке и изменившихся курсах."""
+        dead = False
+        for getter, currencies in list(self._subscribers):
+            callback = getter()
+            if callback is None:
+                dead = True
+                continue
+            if currencies is None:
+                relevant = changes
+            else:
+                relevant = {code: changes[code] for code in currencies if code in changes}
+                if not relevant:
+                    continue
+            try:
+                callback(relevant, snapshot)
+            except Exception:
+                self.logger.exception("Rate subscriber failed.")
+        if dead:
+            with self._subscribers_lock:
+                self._subscribers = [entry for entry in self._subscribers if entry[0]() is not None]
+
+    def _revalidate_in_background(self) -> None:
+        """Запуск фонового обновления устаревшего снимка, если оно еще не запущено."""
+        if not self._revalidate_lock.acquire(blocking=False):
+            return
+
+        def revalidate():
+            try:
+                self._refresh(force=True)
+            finally:
+                self._revalidate_lock.release()
+
+        threading.Thread(target=revalidate, name="RateFetcher-revalidate", daemon=True).start()
+
+    def start_background_refresh(self, lead_time=60) -> None:
+        """
+        Запуск фонового потока, обновляющего курсы незадолго до истечения снимка.
+
+        Новые курсы публикуются атомарной заменой ссылки на неизменяемый снимок,
+        поэтому вызывающие конвертацию никогда не ждут сеть и читают курсы без блокировок.
+
+        Args:
+            lead_time (float): За сколько секунд до истечения снимка начинать обновление
+                               (не больше половины cache_expiry).
+        """
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        if lead_time > self.cache_expiry / 2:
+            # Иначе снимок «истекает» сразу после обновления и API запрашивается без пауз
+            self.logger.warning(f"lead_time {lead_time}s is too large for cache_expiry {self.cache_expiry}s; "
+                                f"using {self.cache_expiry / 2}s.")
+            lead_time = self.cache_expiry / 2
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(target=self._background_refresh_loop, args=(lead_time,),
+                                           name="RateFetcher-refresher", daemon=True)
+        self._refresher.start()
+        self.logger.info("Background rate refresh started.")
+
+    def stop_background_refresh(self, timeout=None) -> None:
+        """
+        Остановка фонового потока обновления курсов.
+
+        Args:
+            timeout (float, optional): Максимальное время ожидания завершения потока в секундах.
+        """
+        self._refresher_stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout)
+            self._refresher = None
+            self.logger.info("Background rate refresh stopped.")
+
+    def _background_refresh_loop(self, lead_time) -> None:
+        """Цикл фонового обновления: ожидание до момента обновления и публикация нового снимка."""
+        while not self._refresher_stop.is_set():
+            snapshot = self._snapshot
+            if snapshot is None:
+                delay = 0
+            else:
+                delay = max(0, self.cache_expiry - lead_time - snapshot.age())
+            if self._refresher_stop.wait(delay):
+                break
+            refreshed = self._refresh(force=snapshot is not None)
+            if refreshed is None or refreshed is snapshot:
+                # Не удалось обновить курсы: повторяем попытку после паузы (не раньше окончания охлаждения)
+                self._refresher_stop.wait(max(self.retry_delay, self.breaker.retry_after(), self._quota_retry_after()))
+
+    def _quota_retry_after(self) -> float:
+        """Секунд до следующего токена квоты (0, если квоты нет или ее файл недоступен)."""
+        if self.quota is None:
+            return 0.0
+        try:
+            return self.quota.retry_after()
+        except OSError:
+            return 0.0
+
+    @traced('rates.fetch')
+    def _fetch_from_api(self) -> dict | None:
+        """
+        Получение обменных курсов из API с повторными попытками.
+
+        Паузы между попытками растут экспоненциально со случайным разбросом.
+        Если автоматический выключатель разомкнут, запрос не выполняется.
+
+        Возвращает словарь с обменными курсами или None в случае ошибки.
+        """
+        import requests
 
         for attempt in range(self.max_retries):
+            if not self._allow_request():
+                return None
+            resolved = False  # Результат попытки учтен в выключателе (иначе пробный запрос «зависнет»)
             try:
                 self.logger.info(f"Fetching rates from API, attempt {attempt + 1}/{self.max_retries}...") # Логирование попытки запроса
-                response = requests.get(self.api_url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if 'rates' in data:
-                    rates = data
-                    self._save_to_cache(rates)
-                    self.logger.info("Rates fetched successfully from API.") # Подтверждение успешного получения
-                    return rates
-                else:
-                    self.logger.error("Response JSON missing 'rates' key.")
+                rates = self._request_rates()
+                if rates is None:
+                    # Ответ без корректных курсов: это неудача, а не успешный запрос
+                    self._record_failure()
+                    resolved = True
+                    if metrics.enabled:
+                        metrics.inc('rates_api_failures_total')
                     return None
+                self.breaker.record_success()
+                resolved = True
+                self._persist(rates)
+                self.logger.info("Rates fetched successfully from API.") # Подтверждение успешного получения
+                return rates
 
             except requests.exceptions.RequestException as e:
                 self.logger.error(f"API request failed (attempt {attempt + 1}/{self.max_retries}): {e}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                self._record_failure()
+                resolved = True
+                if attempt < self.max_retries - 1 and not self.breaker.is_open():
+                    if metrics.enabled:
+                        metrics.inc('rates_api_retries_total')
+                    time.sleep(backoff_delay(self.retry_delay, attempt))
                 else:
+                    if metrics.enabled:
+                        metrics.inc('rates_api_failures_total')
                     self.logger.error("Max retries reached. Unable to fetch rates from API.")
                     return None
             except json.JSONDecodeError as e:
                 self.logger.error(f"Error decoding JSON response: {e}")
+                self._record_failure()
+                resolved = True
                 return None
+            finally:
+                if not resolved:
+                    self._record_failure()  # Непредвиденное исключение тоже считается неудачей
 
-    def _load_from_cache(self) -> dict:
-        """Загрузка обменных курсов из кэш-файла."""
-        if os.path.exists(self.cache_file):
+    def _allow_request(self) -> bool:
+        """Проверка автоматического выключателя и квоты запросов перед запросом к API."""
+        if not self.breaker.allow_request():
+            if metrics.enabled:
+                metrics.inc('rates_api_short_circuits_total')
+            self.logger.debug(f"Circuit breaker open; skipping API request for {self.breaker.retry_after():.1f}s.")
+            return False
+        if self.quota is None:
+            return True
+
+        # Истекшие курсы обновляются в первую очередь и могут подождать токен; досрочные — нет
+        snapshot = self._snapshot
+        urgent = snapshot is None or snapshot.age() >= self.cache_expiry
+        try:
+            if self.quota.acquire(PRIORITY_HIGH if urgent else PRIORITY_NORMAL,
+                                  timeout=self.quota_timeout if urgent else 0):
+                return True
+        except OSError as e:
+            # Файл квоты недоступен: курсы важнее ограничения частоты запросов
+            self.logger.error(f"Unable to use request quota file ({e}); requesting without quota.")
+            return True
+        self.breaker.release_probe()  # Пробный запрос не выполнен: иначе выключатель останется half_open
+        if metrics.enabled:
+            metrics.inc('rates_api_throttled_total')
+        self.logger.warning("API request quota exhausted; skipping request.")
+        return False
+
+    def _defer_requests(self, response) -> None:
+        """Приостановка запросов к API по ответу 429 (и 503 с Retry-After) на срок из заголовка Retry-After."""
+        delay = parse_retry_after(response.headers.get('Retry-After'))
+        if delay is None:
+            if response.status_code != 429:
+                return
+            delay = self.breaker.reset_timeout
+        self.logger.warning(f"Rate API asked to retry after {delay:.0f}s (HTTP {response.status_code}).")
+        self.breaker.open_for(delay)
+        if self.quota is not None:
             try:
-                with open(self.cache_file, 'r') as f:
-                    data = json.load(f)
-                    if 'timestamp' in data and 'rates' in data and time.time() - data['timestamp'] < self.cache_expiry:
-                        self.logger.info("Rates loaded from cache.")
-                        return data
-            except (json.JSONDecodeError, KeyError):
-                self.logger.warning("Invalid cache file or format. Fetching from API.")
-                return None
+                self.quota.block_for(delay)  # Общий запрет для всех процессов хоста
+            except OSError as e:
+                self.logger.error(f"Unable to use request quota file ({e}).")
+
+    def _record_failure(self) -> None:
+        """Учет неудачного запроса в автоматическом выключателе."""
+        if self.breaker.record_failure():
+            self.logger.warning(f"Circuit breaker opened after repeated API failures; "
+                                f"next attempt in {self.breaker.retry_after():.1f}s.")
+
+    def _get_session(self) -> "requests.Session":
+        """
+        Постоянная HTTP-сессия с пулом keep-alive соединений.
+
+        Повторные запросы и повторные попытки используют уже установленное
+        TCP/TLS-соединение вместо нового рукопожатия.
+        """
+        import requests  # Импорт откладывается до первого запроса, чтобы ускорить запуск
+
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=len(self.providers), pool_maxsize=4)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    session.headers['Accept-Encoding'] = requests.utils.DEFAULT_ACCEPT_ENCODING
+                    self._session = session
+        return self._session
+
+    def _request_rates(self) -> dict | None:
+        """
+        Один запрос курсов без повторных попыток (хеджированный, если источников несколько).
+
+        Возвращает курсы в едином виде (см. converters.providers) или None, если ни один
+        источник не вернул курсы. Если все источники завершились ошибкой, последнее
+        исключение requests или ошибка декодирования JSON пробрасывается вызывающему.
+        """
+        known = self._snapshot.data if self._snapshot is not None else self.cache.load()
+        if len(self.providers) == 1:
+            return self._request_provider(self.providers[0], known)
+        return self._hedged_request(known)
+
+    def _get_hedge_pool(self):
+        """Пул потоков для параллельных запросов к нескольким источникам."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        if self._hedge_pool is None:
+            with self._session_lock:
+                if self._hedge_pool is None:
+                    # Проигравшие запросы продолжают выполняться до таймаута, поэтому потоков с запасом
+                    self._hedge_pool = ThreadPoolExecutor(max_workers=2 * len(self.providers),
+                                                          thread_name_prefix="RateFetcher-hedge")
+        return self._hedge_pool
+
+    def _hedged_request(self, known) -> dict | None:
+        """
+        Хеджированный запрос: следующий источник запрашивается, если предыдущие не ответили
+        за hedge_delay секунд или завершились ошибкой; возвращается первый успешный ответ.
+        """
+        import requests
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        pool = self._get_hedge_pool()
+        providers = iter(self.providers)
+        pending = {pool.submit(self._request_provider, next(providers), known)}
+        upcoming = next(providers, None)
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=self.hedge_delay if upcoming is not None else None,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    rates = future.result()
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    error = e
+                    continue
+                if rates is not None:
+                    return rates
+            if upcoming is not None:
+                if not done:
+                    self.logger.info(f"No response within {self.hedge_delay}s; hedging with {upcoming.name}.")
+                    if metrics.enabled:
+                        metrics.inc('rates_api_hedged_requests_total', provider=upcoming.name)
+                pending.add(pool.submit(self._request_provider, upcoming, known))
+                upcoming = next(providers, None)
+        if error is not None:
+            raise error
         return None
 
+    def _request_provider(self, provider, known) -> dict | None:
+        """
+        Один запрос к источнику provider.
+
+        Если известны ETag или Last-Modified последних курсов этого источника, запрос
+        выполняется условно; ответ 304 Not Modified означает, что курсы не изменились, и
+        возвращается копия известных курсов (срок жизни кэша при сохранении продлевается).
+
+        Возвращает курсы в едином виде или None, если ответ не содержит корректных курсов.
+        Исключения requests и ошибки декодирования JSON пробрасываются вызывающему.
+        """
+        if known and known.get('provider', self.providers[0].name) != provider.name:
+            known = None  # ETag другого источника не имеет смысла
+        headers = {}
+        if known:
+            if known.get('etag'):
+                headers['If-None-Match'] = known['etag']
+            if known.get('last_modified'):
+                headers['If-Modified-Since'] = known['last_modified']
+
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            with tracer.span('api.request', provider=provider.name) as span:
+                response = provider.request(self._get_session(), headers)
+                span.set(status=response.status_code)
+            if response.status_code == 304 and known:
+                outcome = 'not_modified'
+                self.logger.info("Rates not modified on server; extending cache lifetime.")
+                return dict(known)
+            if response.status_code in (429, 503):
+                self._defer_requests(response)
+            response.raise_for_status()
+            with tracer.span('api.parse', provider=provider.name):
+                payload = response.json()
+                try:
+                    data = provider.normalize(payload)
+                except (TypeError, ValueError, AttributeError, KeyError) as e:  # Адаптер не ожидал такой ответ
+                    self.logger.error(f"Malformed response from {provider.name}: {e!r}")
+                    data = None
+            if data:
+                outcome = 'ok'
+                data['provider'] = provider.name
+                if response.headers.get('ETag'):
+                    data['etag'] = response.headers['ETag']
+                if response.headers.get('Last-Modified'):
+                    data['last_modified'] = response.headers['Last-Modified']
+                return data
+            outcome = 'invalid'
+            self.logger.error(f"Response from {provider.name} contains no rates.")
+            return None
+        finally:
+            if metrics.enabled:
+                metrics.observe('rates_api_request_duration_seconds', time.perf_counter() - start,
+                                provider=provider.name)
+                metrics.inc('rates_api_requests_total', outcome=outcome, provider=provider.name)
+
+    def _load_from_cache(self, allow_stale=False) -> dict | None:
+        """
+        Загрузка обменных курсов из кэш-файла.
+
+        Args:
+            allow_stale (bool): Возвращать курсы, даже если срок жизни кэша истек.
+        """
+        data = self.cache.load()
+        if data and (allow_stale or time.time() - data['timestamp'] < self.cache_expiry):
+            if metrics.enabled:
+                metrics.inc('rates_cache_hits_total', layer='disk')
+            self.logger.info("Rates loaded from cache.")
+            return data
+        if metrics.enabled:
+            metrics.inc('rates_cache_misses_total', layer='disk')
+        return None
+
+    def _persist(self, rates) -> None:
+        """Сохранение полученных из API курсов в кэш-файл и, если задан history_file, в историю."""
+        self._save_to_cache(rates)
+        if self.history is not None:
+            try:
+                self.history.append(rates)
+            except (IOError, ValueError) as e:
+                self.logger.error(f"Error appending rates to history file: {e}")
+
     def _save_to_cache(self, rates) -> None:
         """Сохранение обменных курсов в кэш-файл."""
         try:
             rates['timestamp'] = time.time()  # Добавляем timestamp при сохранении
-            with open(self.cache_file, 'w') as f:
-                json.dump(rates, f)
+            self.cache.save(rates)
             self.logger.info("Rates saved to cache.")
         except IOError as e:
             self.logger.error(f"Error saving rates to cache file: {e}")
-        except TypeError as e:
-            self.logger.error(f"Error serializing rates to JSON: {e}")
\ No newline at end of file
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Error serializing rates for cache: {e}")
\ No newline at end of file
@@ -0,0 +1,232 @@
+import logging
+import mmap
+import os
+import struct
+import time
+
+from converters.tracing import traced
+from converters.vectorized import NAN, as_float_array, get_numpy
+
+MAGIC = b'RHST'
+VERSION = 1
+CODE_SIZE = 8  # Байт на код валюты в заголовке (ASCII, дополняется нулями)
+_PREFIX = struct.Struct('<4sHI')  # Сигнатура, версия, количество столбцов
+
+
+class HistoricalRateStore:
+    """
+    Хранилище истории обменных курсов в компактном бинарном формате только для добавления.
+
+    Формат файла: заголовок (сигнатура, версия, число валют N и их коды), затем
+    записи фиксированного размера — временная метка float64 и N курсов float64.
+    Набор столбцов фиксируется по первому сохраненному снимку; валюты, которых нет
+    в снимке, записываются как NaN, а новые валюты, отсутствующие в заголовке,
+    не сохраняются. Записи упорядочены по времени, поэтому курс на произвольный
+    момент находится бинарным поиском по отображенному в память файлу без его
+    полной загрузки.
+    """
+    def __init__(self, path="exchange_rates_history.bin") -> None:
+        """
+        Инициализация HistoricalRateStore.
+
+        Args:
+            path (str): Путь к файлу истории.
+        """
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self.currencies = None
+        self.index = None
+        self.header_size = 0
+        self.record = None
+        self._map = None
+        self._map_size = 0
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._read_header()
+
+    def _read_header(self) -> None:
+        """Чтение заголовка существующего файла истории."""
+        with open(self.path, 'rb') as f:
+            magic, version, count = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{self.path} не является файлом истории курсов.")
+            raw_codes = f.read(count * CODE_SIZE)
+        codes = [raw_codes[i:i + CODE_SIZE].rstrip(b'\0').decode('ascii') for i in range(0, len(raw_codes), CODE_SIZE)]
+        self._set_layout(codes)
+
+    def _set_layout(self, codes) -> None:
+        """Настройка расположения столбцов по списку кодов валют."""
+        self.currencies = tuple(codes)
+        self.index = {code: i for i, code in enumerate(codes)}
+        size = _PREFIX.size + len(codes) * CODE_SIZE
+        self.header_size = size + (-size % 8)  # Выравнивание записей по 8 байтам
+        self.record = struct.Struct(f'<{len(codes) + 1}d')
+
+    def _create(self, codes) -> None:
+        """Создание файла истории с заголовком для указанных валют."""
+        self._set_layout(codes)
+        header = _PREFIX.pack(MAGIC, VERSION, len(codes))
+        header += b''.join(code.encode('ascii')[:CODE_SIZE].ljust(CODE_SIZE, b'\0') for code in codes)
+        header = header.ljust(self.header_size, b'\0')
+        with open(self.path, 'wb') as f:
+            f.write(header)
+
+    def __len__(self) -> int:
+        """Количество сохраненных снимков."""
+        if self.record is None or not os.path.exists(self.path):
+            return 0
+        return (os.path.getsize(self.path) - self.header_size) // self.record.size
+
+    @traced('history.append')
+    def append(self, rates_data, timestamp=None) -> bool:
+        """
+        Добавление снимка курсов в историю.
+
+        Args:
+            rates_data (dict): Ответ API с ключом 'rates'.
+            timestamp (float, optional): Момент, с которого действуют курсы. По умолчанию
+                                         берется time_last_updated, timestamp или текущее время.
+
+        Returns:
+            bool: True, если снимок добавлен; False, если он не новее последней записи.
+        """
+        if timestamp is None:
+            timestamp = rates_data.get('time_last_updated') or rates_data.get('timestamp') or time.time()
+        rates = rates_data['rates']
+        if self.record is None:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                self._read_header()  # Файл создан другим процессом
+            else:
+                self._create(sorted(rates))
+
+        last = self.last_timestamp()
+        if last is not None and timestamp <= last:
+            return False
+        unknown = set(rates) - set(self.index)
+        if unknown:
+            self.logger.warning(f"History layout has no columns for {sorted(unknown)}; they are not stored.")
+
+        values = [float(rates.get(code, NAN)) for code in self.currencies]
+        with open(self.path, 'ab') as f:
+            f.write(self.record.pack(float(timestamp), *values))
+        return True
+
+    def last_timestamp(self) -> float | None:
+        """Временная метка последнего снимка или None, если история пуста."""
+        count = len(self)
+        if count == 0:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(self.header_size + (count - 1) * self.record.size)
+            return struct.unpack('<d', f.read(8))[0]
+
+    def _mapped(self) -> mmap.mmap | None:
+        """Отображение файла в память (переотображается, если файл вырос)."""
+        size = os.path.getsize(self.path) if self.record is not None and os.path.exists(self.path) else 0
+        if size <= self.header_size:
+            return None
+        if self._map is None or self._map_size != size:
+            if self._map is not None:
+                self._map.close()
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._map_size = size
+        return self._map
+
+    def find(self, timestamp) -> int | None:
+        """
+        Бинарный поиск последнего снимка, действовавшего на указанный момент.
+
+        Args:
+            timestamp (float | datetime): Момент времени (Unix time или datetime).
+
+        Returns:
+            int: Номер записи или None, если момент раньше первого снимка.
+        """
+        if hasattr(timestamp, 'timestamp'):
+            timestamp = timestamp.timestamp()
+        data = self._mapped()
+        if data is None:
+            return None
+        record_size = self.record.size
+        low, high = 0, (self._map_size - self.header_size) // record_size
+        while low < high:
+            middle = (low + high) // 2
+            if struct.unpack_from('<d', data, self.header_size + middle * record_size)[0] <= timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low - 1 if low > 0 else None
+
+    def rate_at(self, currency, timestamp) -> float | None:
+        """
+        Курс USD к указанной валюте, действовавший на указанный момент.
+
+        Returns:
+            float: Обменный курс или None, если курс неизвестен.
+        """
+        column = self.index.get(currency) if self.index is not None else None
+        if column is None:
+            return None
+        position = self.find(timestamp)
+        if position is None:
+            return None
+        offset = self.header_size + position * self.record.size + (column + 1) * 8
+        rate = struct.unpack_from('<d', self._map, offset)[0]
+        return None if rate != rate else rate  # NaN — валюты не было в снимке
+
+    def convert_at(self, amount, currency, timestamp) -> float | None:
+        """
+        Конвертация USD в указанную валюту по курсу, действовавшему на указанный момент.
+
+        Args:
+            amount (float): Сумма в USD.
+            currency (str): Код валюты назначения.
+            timestamp (float | datetime): Момент совершения операции.
+
+        Returns:
+            float: Сумма в указанной валюте или None, если курс на этот момент неизвестен.
+        """
+        rate = self.rate_at(currency, timestamp)
+        if rate is not None:
+            return amount * rate
+        return None
+
+    def convert_at_batch(self, amounts, currency, timestamps):
+        """
+        Векторизованная конвертация множества операций по историческим курсам.
+
+        Args:
+            amounts: Суммы в USD.
+            currency (str): Код валюты назначения.
+            timestamps: Моменты операций (Unix time) той же длины, что и amounts.
+
+        Returns:
+            Массив сумм в указанной валюте (NaN, если курс на момент операции неизвестен).
+        """
+        np = get_numpy()
+        values = as_float_array(amounts)
+        moments = as_float_array(timestamps)
+        column = self.index.get(currency) if self.index is not None else None
+        if column is None or self._mapped() is None:
+            return values * NAN if np is not None else [NAN] * len(values)
+
+        if np is None:
+            result = []
+            for value, moment in zip(values, moments):
+                rate = self.rate_at(currency, moment)
+                result.append(NAN if rate is None else value * rate)
+            return result
+
+        count = (self._map_size - self.header_size) // self.record.size
+        table = np.frombuffer(self._map, dtype='<f8', count=count * (len(self.currencies) + 1),
+                              offset=self.header_size).reshape(count, -1)
+        positions = np.searchsorted(table[:, 0], moments, side='right') - 1
+        rates = table[np.maximum(positions, 0), column + 1]
+        return np.where(positions >= 0, values * rates, NAN)
+
+    def close(self) -> None:
+        """Освобождение отображения файла в память."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._map_size = 0
\ No newline at end of file
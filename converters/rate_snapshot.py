@@ -0,0 +1,61 @@
+import time
+from types import MappingProxyType
+
+
+class RateSnapshot:
+    """
+    Неизменяемый снимок обменных курсов, хранящийся в памяти.
+
+    Снимок никогда не изменяется после создания: обновление курсов выполняется
+    заменой ссылки на новый снимок, поэтому читать его можно без блокировок.
+    """
+    __slots__ = ('data', 'rates', 'timestamp')
+
+    def __init__(self, data, timestamp=None) -> None:
+        """
+        Инициализация RateSnapshot.
+
+        Args:
+            data (dict): Ответ API с ключом 'rates' (как его возвращает RateFetcher.fetch_rates).
+            timestamp (float, optional): Время получения курсов. По умолчанию берется
+                                         data['timestamp'] или текущее время.
+        """
+        if timestamp is None:
+            timestamp = data.get('timestamp') or time.time()
+        payload = dict(data)
+        payload['rates'] = MappingProxyType(dict(data['rates']))
+        object.__setattr__(self, 'rates', payload['rates'])
+        object.__setattr__(self, 'data', MappingProxyType(payload))
+        object.__setattr__(self, 'timestamp', timestamp)
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError("RateSnapshot является неизменяемым.")
+
+    def age(self, now=None) -> float:
+        """Возраст снимка в секундах."""
+        return (time.time() if now is None else now) - self.timestamp
+
+    def get(self, currency):
+        """Курс USD к указанной валюте или None, если валюта отсутствует."""
+        return self.rates.get(currency)
+
+    def changes_since(self, previous) -> dict:
+        """
+        Курсы, изменившиеся по сравнению с предыдущим снимком.
+
+        Args:
+            previous (RateSnapshot | None): Предыдущий снимок (None — все курсы считаются новыми).
+
+        Returns:
+            dict: {код валюты: (старый курс, новый курс)}; None вместо курса означает,
+                  что валюта появилась или исчезла.
+        """
+        rates = self.rates
+        if previous is None:
+            return {code: (None, rate) for code, rate in rates.items()}
+        old_rates = previous.rates
+        changes = {code: (old_rates.get(code), rate) for code, rate in rates.items() if old_rates.get(code) != rate}
+        for code, rate in old_rates.items():
+            if code not in rates:
+                changes[code] = (rate, None)
+        return changes
\ No newline at end of file
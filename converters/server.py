@@ -0,0 +1,378 @@
+"""
+Долгоживущий сервер конвертации на asyncio (HTTP/1.1 поверх TCP или Unix-сокета).
+
+Сервер держит курсы в памяти (фоновое обновление RateFetcher), поэтому запросы
+не запускают новый процесс и не читают кэш-файл. Одиночные запросы, поступившие
+в течение batch_window секунд, объединяются в пакеты и конвертируются
+векторизованно (см. MicroBatcher).
+
+Эндпоинты:
+    GET  /convert?amount=10&to=EUR[&from=USD]      -> {"amount", "from", "to", "result", "stale"}
+    POST /convert/batch {"amounts": [...], "currencies": [...], "from": "USD"}
+                                                   -> {"from", "currencies", "results", "stale"}
+    GET  /rates                                    -> курсы текущего снимка
+    GET  /health                                   -> {"status", "rates_age", "stale"}
+    GET  /metrics                                  -> метрики в формате Prometheus
+
+Пример:
+    python main.py --serve 127.0.0.1:8080
+    curl 'http://127.0.0.1:8080/convert?amount=100&to=EUR'
+"""
+import asyncio
+import json
+import logging
+import math
+from collections import defaultdict
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from converters.async_rate_fetcher import AsyncRateFetcher
+from converters.cross_rate_converter import CrossRateConverter
+from converters.metrics import metrics
+from converters.rate_fetcher import RateFetcher
+from converters.tracing import traced
+
+DEFAULT_ADDRESS = "127.0.0.1:8080"
+DEFAULT_BATCH_WINDOW = 0.001  # Окно объединения одиночных запросов в секундах
+DEFAULT_MAX_BATCH = 4096
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+
+class RequestError(Exception):
+    """Ошибка в запросе клиента (ответ 4xx)."""
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _to_json_number(value) -> float | None:
+    """
+    Результат конвертации для JSON (NaN — неизвестная валюта — заменяется на null).
+
+    Raises:
+        RequestError: Если результат бесконечен (переполнение float).
+    """
+    value = float(value)
+    if math.isnan(value):
+        return None
+    if math.isinf(value):
+        raise RequestError("conversion result is out of range")
+    return value
+
+
+def _parse_amount(value) -> float:
+    """
+    Сумма из запроса клиента.
+
+    Raises:
+        ValueError: Если значение не является конечным числом (например, 'nan' или '1e309').
+    """
+    amount = float(value)
+    if not math.isfinite(amount):
+        raise ValueError(f"amount must be a finite number: {value!r}")
+    return amount
+
+
+def _column(result, index) -> list:
+    """Столбец матрицы «суммы × валюты» в виде списка float."""
+    if hasattr(result, 'tolist'):
+        return result[:, index].tolist()
+    return [row[index] for row in result]
+
+
+def _rows(result) -> list:
+    """Строки матрицы «суммы × валюты» для JSON (NaN заменяется на null)."""
+    rows = result.tolist() if hasattr(result, 'tolist') else [row.tolist() for row in result]
+    return [[_to_json_number(value) for value in row] for row in rows]
+
+
+class MicroBatcher:
+    """
+    Объединение одновременных одиночных конвертаций в векторизованные пакеты.
+
+    Первый запрос в пустой очереди откладывает обработку на window секунд;
+    все запросы, пришедшие за это время (но не более max_batch), группируются
+    по паре валют и конвертируются одним вызовом convert_batch по самому новому
+    снимку курсов из очереди (снимок получают вызывающие, см. AsyncRateFetcher).
+    """
+    def __init__(self, converter, window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH) -> None:
+        """
+        Инициализация MicroBatcher.
+
+        Args:
+            converter (CrossRateConverter): Конвертер с методом convert_batch.
+            window (float): Окно объединения запросов в секундах (0 — до следующей итерации цикла событий).
+            max_batch (int): Максимальный размер пакета; при достижении пакет обрабатывается сразу.
+        """
+        self.converter = converter
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = []
+        self._timer = None
+
+    def convert(self, amount, from_currency, to_currency, snapshot=None) -> asyncio.Future:
+        """
+        Постановка конвертации в очередь.
+
+        Args:
+            amount (float): Сумма в исходной валюте.
+            from_currency (str): Код исходной валюты.
+            to_currency (str): Код валюты назначения.
+            snapshot (RateSnapshot, optional): Снимок курсов; если None, convert_batch
+                                               берет текущий снимок синхронно.
+
+        Returns:
+            asyncio.Future: Будущий результат (float; NaN, если курс недоступен).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((amount, from_currency, to_currency, future, snapshot))
+        if len(self._queue) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    @traced('server.batch')
+    def flush(self) -> None:
+        """Конвертация всех запросов из очереди."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        queue, self._queue = self._queue, []
+        if not queue:
+            return
+        if metrics.enabled:
+            metrics.inc('server_batches_total')
+            metrics.inc('server_batched_conversions_total', len(queue))
+
+        snapshot = queue[-1][4]  # Снимки в очереди только новеют: последний — самый новый
+        groups = defaultdict(list)
+        for item in queue:
+            groups[item[1], item[2]].append(item)
+        for (from_currency, to_currency), items in groups.items():
+            try:
+                result = self.converter.convert_batch([item[0] for item in items], from_currency, [to_currency],
+                                                      snapshot=snapshot)
+                values = _column(result, 0)
+            except Exception as e:  # Ошибка передается ожидающим запросам, а не циклу событий
+                for item in items:
+                    if not item[3].done():
+                        item[3].set_exception(e)
+                continue
+            for item, value in zip(items, values):
+                if not item[3].done():
+                    item[3].set_result(value)
+
+
+class ConversionServer:
+    """
+    HTTP-сервер конвертации валют на asyncio.
+
+    Реализует минимальное подмножество HTTP/1.1 (keep-alive, Content-Length) без
+    сторонних зависимостей; предназначен для локального использования за
+    обратным прокси или через Unix-сокет.
+    """
+    def __init__(self, rate_fetcher=None, batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH) -> None:
+        """
+        Инициализация ConversionServer.
+
+        Args:
+            rate_fetcher (RateFetcher, optional): Экземпляр RateFetcher.
+                                                 Если None, используется Singleton RateFetcher.
+            batch_window (float): Окно объединения одиночных запросов в секундах.
+            max_batch (int): Максимальный размер пакета.
+        """
+        self.rate_fetcher = rate_fetcher or RateFetcher()
+        self.async_fetcher = AsyncRateFetcher(self.rate_fetcher)
+        self.converter = CrossRateConverter(self.rate_fetcher)
+        self.batcher = MicroBatcher(self.converter, batch_window, max_batch)
+        self.logger = logging.getLogger(__name__)
+        self._server = None
+        self._routes = {
+            ('GET', '/convert'): self._handle_convert,
+            ('POST', '/convert/batch'): self._handle_convert_batch,
+            ('GET', '/rates'): self._handle_rates,
+            ('GET', '/health'): self._handle_health,
+            ('GET', '/metrics'): self._handle_metrics,
+        }
+
+    async def start(self, address=DEFAULT_ADDRESS) -> None:
+        """
+        Запуск сервера.
+
+        Args:
+            address (str): 'host:port' для TCP или 'unix:/path/to.sock' для Unix-сокета.
+        """
+        # Курсы загружаются до приема запросов и далее обновляются в фоне
+        await self.async_fetcher.get_snapshot()
+        self.rate_fetcher.start_background_refresh()
+        if address.startswith('unix:'):
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=address[len('unix:'):])
+        else:
+            host, _, port = address.rpartition(':')
+            self._server = await asyncio.start_server(self._handle_connection, host or '127.0.0.1', int(port))
+        self.logger.info(f"Conversion server listening on {address}.")
+
+    @property
+    def sockets(self) -> tuple:
+        """Слушающие сокеты (например, чтобы узнать порт при запуске на порту 0)."""
+        return self._server.sockets if self._server is not None else ()
+
+    async def serve_forever(self) -> None:
+        """Обработка запросов до отмены задачи."""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Остановка сервера и фонового обновления курсов."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self.batcher.flush()
+        self.rate_fetcher.stop_background_refresh(timeout=1)
+
+    async def _handle_connection(self, reader, writer) -> None:
+        """Обработка запросов одного соединения (keep-alive)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._send(writer, HTTPStatus.BAD_REQUEST, {'error': 'malformed request line'}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                length = headers.get('content-length') or '0'
+                if not (length.isascii() and length.isdigit()):
+                    await self._send(writer, HTTPStatus.BAD_REQUEST, {'error': 'invalid Content-Length'}, False)
+                    break
+                length = int(length)
+                if length > MAX_BODY_SIZE:
+                    await self._send(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'request body too large'},
+                                     False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self._dispatch(method, target, body)
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, body) -> tuple:
+        """Вызов обработчика эндпоинта; возвращает (HTTP-статус, тело ответа)."""
+        url = urlsplit(target)
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self._routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f'method {method} not allowed'}
+            return HTTPStatus.NOT_FOUND, {'error': f'unknown endpoint {url.path}'}
+        try:
+            return HTTPStatus.OK, await handler(parse_qs(url.query), body)
+        except RequestError as e:
+            return e.status, {'error': str(e)}
+        except Exception:
+            self.logger.exception("Unhandled error while serving request.")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': 'internal error'}
+
+    @staticmethod
+    async def _send(writer, status, payload, keep_alive) -> None:
+        """Отправка ответа (JSON или текст, если payload — строка)."""
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body = json.dumps(payload, separators=(',', ':'), allow_nan=False).encode('utf-8')
+            content_type = 'application/json'
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def _current_snapshot(self):
+        """Текущий снимок курсов (без ожидания сети, если курсы уже загружены)."""
+        snapshot = await self.async_fetcher.get_snapshot()
+        if snapshot is None:
+            raise RequestError("exchange rates are unavailable", HTTPStatus.SERVICE_UNAVAILABLE)
+        return snapshot
+
+    async def _handle_convert(self, query, body) -> dict:
+        """GET /convert: одиночная конвертация через MicroBatcher."""
+        try:
+            amount = _parse_amount(query['amount'][0])
+            to_currency = query['to'][0].upper()
+        except (KeyError, ValueError):
+            raise RequestError("expected query parameters amount=<finite number>&to=<currency>")
+        from_currency = query.get('from', ['USD'])[0].upper()
+        snapshot = await self._current_snapshot()
+        result = _to_json_number(await self.batcher.convert(amount, from_currency, to_currency, snapshot))
+        if result is None:
+            raise RequestError(f"unknown currency pair {from_currency}/{to_currency}", HTTPStatus.NOT_FOUND)
+        return {'amount': amount, 'from': from_currency, 'to': to_currency, 'result': result,
+                'stale': self.rate_fetcher.is_stale(snapshot)}
+
+    async def _handle_convert_batch(self, query, body) -> dict:
+        """POST /convert/batch: векторизованная конвертация массива сумм в несколько валют."""
+        try:
+            request = json.loads(body)
+            amounts = [_parse_amount(amount) for amount in request['amounts']]
+            currencies = [str(code).upper() for code in request['currencies']]
+            from_currency = str(request.get('from', 'USD')).upper()
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise RequestError('expected JSON body {"amounts": [...], "currencies": [...], "from": "USD"}')
+        snapshot = await self._current_snapshot()
+        result = self.converter.convert_batch(amounts, from_currency, currencies, snapshot=snapshot)
+        return {'from': from_currency, 'currencies': currencies, 'results': _rows(result),
+                'stale': self.rate_fetcher.is_stale(snapshot)}
+
+    async def _handle_rates(self, query, body) -> dict:
+        """GET /rates: курсы текущего снимка."""
+        snapshot = await self._current_snapshot()
+        data = {key: value for key, value in snapshot.data.items() if key not in ('rates', 'etag', 'last_modified')}
+        data['rates'] = dict(snapshot.rates)
+        data['stale'] = self.rate_fetcher.is_stale(snapshot)
+        return data
+
+    async def _handle_health(self, query, body) -> dict:
+        """GET /health: состояние сервера и возраст курсов."""
+        age = self.rate_fetcher.snapshot_age()
+        return {'status': 'ok' if age is not None else 'no_rates', 'rates_age': age,
+                'stale': self.rate_fetcher.is_stale(), 'circuit_breaker': self.rate_fetcher.breaker.state}
+
+    async def _handle_metrics(self, query, body) -> str:
+        """GET /metrics: метрики в текстовом формате Prometheus."""
+        return metrics.render_prometheus()
+
+
+async def serve(address=DEFAULT_ADDRESS, batch_window=DEFAULT_BATCH_WINDOW, rate_fetcher=None) -> None:
+    """
+    Запуск сервера конвертации до отмены задачи (Ctrl+C).
+
+    Args:
+        address (str): 'host:port' или 'unix:/path/to.sock'.
+        batch_window (float): Окно объединения одиночных запросов в секундах.
+        rate_fetcher (RateFetcher, optional): Экземпляр RateFetcher.
+    """
+    server = ConversionServer(rate_fetcher, batch_window=batch_window)
+    await server.start(address)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
\ No newline at end of file
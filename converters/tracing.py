@@ -0,0 +1,258 @@
+"""
+Профилирование: вложенные интервалы времени (spans) вокруг загрузки и сохранения
+кэша, запросов к API и пакетной конвертации.
+
+По умолчанию трассировка выключена: tracer.span() возвращает общий пустой
+контекстный менеджер и ничего не записывает. Включенная трассировка сохраняется
+в формате Chrome Trace (chrome://tracing, Perfetto, speedscope) или в формате
+свернутых стеков для flamegraph.pl (файл с расширением .folded).
+
+Пример:
+    from converters import profiling
+    with profiling("trace.json"):
+        bulk_convert(...)
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+DEFAULT_MAX_EVENTS = 1_000_000
+
+
+class _NullSpan:
+    """Пустой интервал, возвращаемый при выключенной трассировке."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+    def set(self, **args) -> None:
+        """Аргументы интервала при выключенной трассировке не сохраняются."""
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Интервал времени с именем и аргументами; вложенность определяется стеком потока."""
+    __slots__ = ('tracer', 'name', 'args', 'start', 'stack')
+
+    def __init__(self, tracer, name, args) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+        stack.append(self.name)
+        self.stack = tuple(stack)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        end = time.perf_counter_ns()
+        self.tracer._stack().pop()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer._record(self, end)
+
+    def set(self, **args) -> None:
+        """Добавление аргументов (например, размера пакета или HTTP-статуса) к интервалу."""
+        self.args.update(args)
+
+
+class Tracer:
+    """
+    Сборщик интервалов времени для профилирования.
+
+    Интервалы записываются в память (не более max_events) и выгружаются
+    методом write (или chrome_trace и folded).
+    """
+    def __init__(self, max_events=DEFAULT_MAX_EVENTS) -> None:
+        """
+        Инициализация Tracer.
+
+        Args:
+            max_events (int): Максимальное количество сохраняемых интервалов; лишние отбрасываются.
+        """
+        self.enabled = False
+        self.max_events = max_events
+        self.dropped = 0
+        self._events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    def enable(self) -> None:
+        """Включение трассировки."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Выключение трассировки (записанные интервалы сохраняются)."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Удаление записанных интервалов."""
+        with self._lock:
+            self._events = []
+            self.dropped = 0
+            self._origin = time.perf_counter_ns()
+
+    def _after_fork(self) -> None:
+        """Сброс состояния в дочернем процессе: интервалы и стеки родителя ему не принадлежат."""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._events = []
+        self.dropped = 0
+        self._pid = os.getpid()
+
+    def span(self, name, **args):
+        """
+        Контекстный менеджер, измеряющий время выполнения блока.
+
+        Args:
+            name (str): Имя интервала (например, 'cache.load').
+            **args: Дополнительные сведения, сохраняемые вместе с интервалом.
+
+        Returns:
+            Span или NULL_SPAN, если трассировка выключена.
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def _stack(self) -> list:
+        """Стек имен открытых интервалов текущего потока."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, span, end) -> None:
+        """Сохранение завершенного интервала."""
+        event = (span.name, span.start, end - span.start, self._pid, threading.get_ident(), span.args, span.stack)
+        with self._lock:
+            if len(self._events) < self.max_events:
+                self._events.append(event)
+            else:
+                self.dropped += 1
+
+    def events(self) -> list:
+        """Записанные интервалы: (имя, начало в нс, длительность в нс, процесс, поток, аргументы, стек)."""
+        with self._lock:
+            return list(self._events)
+
+    def drain(self) -> list:
+        """
+        Извлечение записанных интервалов с очисткой буфера.
+
+        Используется рабочими процессами, чтобы передать интервалы родителю вместе с результатом задачи.
+        """
+        with self._lock:
+            events, self._events = self._events, []
+            return events
+
+    def extend(self, events) -> None:
+        """
+        Добавление интервалов, записанных в другом процессе (см. drain).
+
+        Процесс и поток интервалов сохраняются. Время perf_counter_ns монотонно для всей системы,
+        поэтому интервалы процессов располагаются на общей шкале.
+
+        Args:
+            events (list): Интервалы в формате events().
+        """
+        with self._lock:
+            free = self.max_events - len(self._events)
+            self._events.extend(events[:max(free, 0)])
+            self.dropped += max(len(events) - max(free, 0), 0)
+
+    def chrome_trace(self) -> dict:
+        """Записанные интервалы в формате Chrome Trace Event (события 'X' с временем в микросекундах)."""
+        origin = self._origin
+        trace_events = [
+            {'name': name, 'cat': name.split('.', 1)[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+             'ts': (start - origin) / 1000, 'dur': duration / 1000, 'args': args}
+            for name, start, duration, pid, tid, args, _ in self.events()
+        ]
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms',
+                'otherData': {'dropped_events': self.dropped}}
+
+    def folded(self) -> list:
+        """
+        Собственное время каждого стека в формате свернутых стеков ('a;b;c микросекунды').
+
+        Время вложенных интервалов вычитается из времени родителя, как у выборок профилировщика.
+        """
+        self_time = defaultdict(int)
+        for _, _, duration, _, _, _, stack in self.events():
+            self_time[stack] += duration
+            if len(stack) > 1:
+                self_time[stack[:-1]] -= duration
+        return [f"{';'.join(stack)} {max(0, duration) // 1000}" for stack, duration in sorted(self_time.items())]
+
+    def write(self, path) -> None:
+        """
+        Запись трассировки в файл: свернутые стеки для '*.folded', иначе Chrome Trace JSON.
+
+        Args:
+            path (str): Путь к файлу.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith('.folded'):
+                f.write('\n'.join(self.folded()) + '\n')
+            else:
+                json.dump(self.chrome_trace(), f)
+
+
+tracer = Tracer()  # Трассировщик пакета
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=tracer._after_fork)
+
+
+def traced(name):
+    """
+    Декоратор, измеряющий каждый вызов функции как интервал name.
+
+    При выключенной трассировке функция вызывается напрямую (одна проверка флага).
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with Span(tracer, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextlib.contextmanager
+def profiling(path=None):
+    """
+    Включение профилирования на время блока with.
+
+    Args:
+        path (str, optional): Файл для записи трассировки по выходе из блока
+                              (см. Tracer.write); если None, интервалы остаются в tracer.
+
+    Yields:
+        Tracer: Трассировщик пакета.
+    """
+    was_enabled = tracer.enabled
+    tracer.enable()
+    try:
+        yield tracer
+    finally:
+        if not was_enabled:
+            tracer.disable()
+        if path is not None:
+            tracer.write(path)
\ No newline at end of file
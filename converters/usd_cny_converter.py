@@ -1,26 +1,27 @@
-import json
-import time
-import os
 from typing import Any
 
 from converters.usd_converter import UsdConverter
+from converters.metrics import metrics
 from converters.rate_fetcher import RateFetcher
 
 class UsdCnyConverter(UsdConverter):
     """
     Конвертер USD в CNY (китайский юань).
 
-    Использует RateFetcher для получения обменных курсов и кэширования.
+    Использует RateFetcher для получения обменных курсов.
     """
-    def __init__(self, rate_fetcher=None, cache_file="exchange_rates.json", cache_expiry=3600) -> None:
+    currency = 'CNY'
+
+    def __init__(self, rate_fetcher=None, cache_file="exchange_rates.cache", cache_expiry=3600) -> None:
         """
         Инициализация UsdCnyConverter.
 
         Args:
             rate_fetcher (RateFetcher, optional): Экземпляр RateFetcher.
                                                  Если None, создается новый экземпляр.
-            cache_file (str, optional): Путь к файлу кэша.
-            cache_expiry (int, optional): Время жизни кэша в секундах.
+            cache_file (str, optional): Путь к файлу кэша (сохранен для совместимости,
+                                        кэшированием курсов управляет RateFetcher).
+            cache_expiry (int, optional): Время жизни кэша в секундах (сохранен для совместимости).
         """
         super().__init__(rate_fetcher or RateFetcher())
         self.cache_file = cache_file
@@ -28,42 +29,11 @@ class UsdCnyConverter(UsdConverter):
 
     def get_exchange_rate(self) -> Any | None:
         """
-        Получение обменного курса USD к CNY.
+        Получение обменного курса USD к CNY из снимка курсов RateFetcher.
 
         Возвращает обменный курс или None в случае ошибки.
         """
-        rates = self._load_from_cache()
-        if rates:
-            return rates.get('CNY')
-
-        rates_data = self.rate_fetcher.fetch_rates()
-        if rates_data and 'rates' in rates_data:
-            rates = rates_data['rates']
-            self._save_to_cache(rates)
-            return rates.get('CNY')
-        return None
-
-    def _load_from_cache(self) -> Any | None:
-        """Загрузка курсов из кэша."""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    data = json.load(f)
-                    if time.time() - data['timestamp'] < self.cache_expiry:
-                        return data['rates']
-            except (json.JSONDecodeError, KeyError):
-                print("Invalid cache file. Fetching from API.") # Можно заменить на logging.warning
-                return None
-        return None
-
-    def _save_to_cache(self, rates) -> None:
-        """Сохранение курсов в кэш."""
-        try:
-            data = {'timestamp': time.time(), 'rates': rates}
-            with open(self.cache_file, 'w') as f:
-                json.dump(data, f)
-        except IOError as e:
-            print(f"Error saving to cache: {e}") # Можно заменить на logging.error
+        return self.rate_fetcher.get_rate(self.currency)
 
     def convert_usd_to_cny(self, amount) -> float | None:
         """
@@ -77,6 +47,8 @@ class UsdCnyConverter(UsdConverter):
         """
         rate = self.get_exchange_rate()
         if rate is not None:
+            if metrics.enabled:
+                metrics.inc('conversions_total', currency=self.currency)
             return amount * rate
         return None
 
@@ -1,5 +1,9 @@
+import time
 from abc import ABC
 from converters.currency_converter import CurrencyConverter
+from converters.metrics import count_conversions
+from converters.tracing import traced
+from converters.vectorized import NAN, outer_multiply
 
 class UsdConverter(CurrencyConverter, ABC):
     """
@@ -8,14 +12,45 @@ class UsdConverter(CurrencyConverter, ABC):
     Предоставляет базовую структуру и требует реализации методов
     для получения обменного курса и выполнения конвертации в конкретную валюту.
     """
+    currency = None  # Код валюты назначения, задается в подклассах
+    rates = None     # Курс, сохраненный подклассом после первой конвертации
+    rates_expire_at = 0.0  # Unix-время, после которого сохраненный курс запрашивается снова
     def __init__(self, rate_fetcher) -> None:
         """
         Инициализация UsdConverter.
 
+        Конвертер подписывается на изменения курса своей валюты, поэтому
+        сохраненный курс self.rates обновляется при каждом обновлении курсов.
+        После истечения срока жизни снимка курс запрашивается снова (см. _refresh_rate),
+        что запускает обновление курсов в RateFetcher.
+
         Args:
             rate_fetcher (RateFetcher): Экземпляр RateFetcher для получения обменных курсов.
         """
         self.rate_fetcher = rate_fetcher
+        if self.currency is not None:
+            rate_fetcher.subscribe(self._on_rates_changed, currencies=(self.currency,), weak=True)
+
+    def _on_rates_changed(self, changes, snapshot) -> None:
+        """Обновление сохраненного курса при изменении курса валюты конвертера."""
+        if self.rates is not None:
+            self.rates = changes[self.currency][1]
+            self.rates_expire_at = snapshot.timestamp + self.rate_fetcher.cache_expiry
+
+    def _refresh_rate(self) -> float | None:
+        """
+        Повторный запрос курса через get_exchange_rate и срока его жизни.
+
+        Подклассы вызывают метод при первой конвертации и после rates_expire_at:
+        сама подписка не обновляет курсы, если к RateFetcher больше никто не обращается.
+
+        Returns:
+            float: Обменный курс или None в случае ошибки.
+        """
+        self.rates = self.get_exchange_rate()
+        age = self.rate_fetcher.snapshot_age()
+        self.rates_expire_at = time.time() + self.rate_fetcher.cache_expiry - age if age is not None else 0.0
+        return self.rates
 
     def get_exchange_rate(self) -> float:
         """
@@ -37,4 +72,27 @@ class UsdConverter(CurrencyConverter, ABC):
             NotImplementedError: Если метод не реализован в подклассе.
         """
         raise NotImplementedError(f"{self.__class__.__name__} должен реализовать метод "
-                                  "convert_usd для конвертации в конкретную валюту.")
\ No newline at end of file
+                                  "convert_usd для конвертации в конкретную валюту.")
+
+    @traced('convert.batch')
+    def convert_usd_batch(self, amounts, currencies):
+        """
+        Векторизованная конвертация массива сумм USD в несколько валют.
+
+        Курс запрашивается один раз, а сравнение кодов валют выполняется
+        один раз на столбец, а не для каждой суммы.
+
+        Args:
+            amounts: Массив NumPy, буфер или последовательность сумм в USD.
+            currencies (list[str]): Коды валют назначения.
+
+        Returns:
+            Матрица «суммы × валюты»; столбцы неподдерживаемых валют заполнены NaN.
+        """
+        rate = self.get_exchange_rate()
+        if rate is None:
+            rate = NAN
+        column_rates = [rate if currency == self.currency else NAN for currency in currencies]
+        result = outer_multiply(amounts, column_rates)
+        count_conversions(len(result), currencies, column_rates)
+        return result
\ No newline at end of file
@@ -1,7 +1,9 @@
 import logging
+import time
 from typing import Any
 
 from converters.usd_converter import UsdConverter
+from converters.metrics import metrics
 from converters.rate_fetcher import RateFetcher
 
 class UsdGbpConverter(UsdConverter):
@@ -9,6 +11,8 @@ class UsdGbpConverter(UsdConverter):
     Конвертер USD в GBP (британский фунт стерлингов).
     Использует RateFetcher для получения обменных курсов.
     """
+    currency = 'GBP'
+
     def __init__(self, rate_fetcher=None) -> None:
         """
         Инициализация UsdGbpConverter.
@@ -19,17 +23,18 @@ class UsdGbpConverter(UsdConverter):
         """
         super().__init__(rate_fetcher or RateFetcher())
         self.logger = self._setup_logger()
-        self.rates = self.get_exchange_rate()
+        self.rates = None  # Курс запрашивается при первой конвертации
 
 
     def _setup_logger(self) -> logging.Logger:
         """Настройка логгера."""
         logger = logging.getLogger(__name__)
-        logger.setLevel(logging.INFO)
-        ch = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        ch.setFormatter(formatter)
-        logger.addHandler(ch)
+        if not logger.handlers:  # Обработчик добавляется один раз на процесс
+            logger.setLevel(logging.INFO)
+            ch = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            ch.setFormatter(formatter)
+            logger.addHandler(ch)
         return logger
 
     def get_exchange_rate(self) -> Any | None:
@@ -38,10 +43,7 @@ class UsdGbpConverter(UsdConverter):
 
         Возвращает обменный курс или None в случае ошибки.
         """
-        rates_data = self.rate_fetcher.fetch_rates()
-        if rates_data and 'rates' in rates_data:
-            return rates_data['rates'].get('GBP')
-        return None
+        return self.rate_fetcher.get_rate(self.currency)
 
 
     def convert_usd_to_gbp(self, amount) -> float | None:
@@ -54,8 +56,13 @@ class UsdGbpConverter(UsdConverter):
         Returns:
             float: Сумма в GBP или None в случае ошибки получения курса.
         """
-        if self.rates is not None:
-            return amount * self.rates
+        rate = self.rates
+        if rate is None or time.time() >= self.rates_expire_at:
+            rate = self._refresh_rate()
+        if rate is not None:
+            if metrics.enabled:
+                metrics.inc('conversions_total', currency=self.currency)
+            return amount * rate
         return None
 
     def convert_usd(self, amount, to_currency) -> float | None:
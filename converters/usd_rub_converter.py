@@ -1,4 +1,7 @@
+import time
+
 from converters.usd_converter import UsdConverter
+from converters.metrics import metrics
 from converters.rate_fetcher import RateFetcher
 
 class UsdRubConverter(UsdConverter):
@@ -6,6 +9,8 @@ class UsdRubConverter(UsdConverter):
     Конвертер USD в RUB (российский рубль).
     Использует RateFetcher для получения обменных курсов.
     """
+    currency = 'RUB'
+
     def __init__(self, rate_fetcher=None) -> None:
         """
         Инициализация UsdRubConverter.
@@ -15,7 +20,7 @@ class UsdRubConverter(UsdConverter):
                                                  Если None, создается новый экземпляр.
         """
         super().__init__(rate_fetcher or RateFetcher())
-        self.rates = self.get_exchange_rate()
+        self.rates = None  # Курс запрашивается при первой конвертации
 
 
     def get_exchange_rate(self) -> float | None:
@@ -24,10 +29,7 @@ class UsdRubConverter(UsdConverter):
 
         Возвращает обменный курс или None в случае ошибки.
         """
-        rates_data = self.rate_fetcher.fetch_rates()
-        if rates_data and 'rates' in rates_data:
-            return rates_data['rates'].get('RUB')
-        return None
+        return self.rate_fetcher.get_rate(self.currency)
 
     def convert_usd_to_rub(self, amount) -> float | None:
         """
@@ -39,8 +41,13 @@ class UsdRubConverter(UsdConverter):
         Returns:
             float: Сумма в RUB или None в случае ошибки получения курса.
         """
-        if self.rates is not None:
-            return amount * self.rates
+        rate = self.rates
+        if rate is None or time.time() >= self.rates_expire_at:
+            rate = self._refresh_rate()
+        if rate is not None:
+            if metrics.enabled:
+                metrics.inc('conversions_total', currency=self.currency)
+            return amount * rate
         return None
 
     def convert_usd(self, amount, to_currency) -> float | None:
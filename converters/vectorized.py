@@ -0,0 +1,63 @@
+"""
+Вспомогательные функции для векторизованной (пакетной) конвертации.
+
+Если установлен NumPy, вычисления выполняются им за один векторный проход,
+иначе используется модуль array стандартной библиотеки. NumPy импортируется
+при первом использовании, чтобы не замедлять запуск пакета.
+"""
+import functools
+import math
+from array import array
+
+NAN = math.nan
+
+
+@functools.cache
+def get_numpy():
+    """Модуль NumPy или None, если он не установлен (импортируется при первом вызове)."""
+    try:
+        import numpy
+    except ImportError:  # NumPy необязателен
+        return None
+    return numpy
+
+
+def as_float_array(amounts):
+    """
+    Приведение входных сумм к одномерному массиву float64.
+
+    Args:
+        amounts: Массив NumPy, объект с буферным протоколом или любая итерируемая последовательность чисел.
+
+    Returns:
+        numpy.ndarray или array('d'): Массив сумм.
+    """
+    np = get_numpy()
+    if np is not None:
+        return np.asarray(amounts, dtype=np.float64).reshape(-1)
+    if isinstance(amounts, array) and amounts.typecode == 'd':
+        return amounts
+    if isinstance(amounts, memoryview):
+        if amounts.ndim > 1:
+            amounts = amounts.cast('B').cast(amounts.format)  # Плоское представление того же буфера
+        return array('d', amounts.tolist())  # Преобразование значений, а не байтов (формат 'i', 'f' и т.п.)
+    return array('d', amounts)
+
+
+def outer_multiply(amounts, rates):
+    """
+    Построение матрицы «суммы × валюты»: result[i][j] = amounts[i] * rates[j].
+
+    Args:
+        amounts: Суммы в USD (см. as_float_array).
+        rates (list[float]): Курсы для каждого столбца (NaN для неподдерживаемых валют).
+
+    Returns:
+        numpy.ndarray формы (len(amounts), len(rates)) или список строк array('d'),
+        если NumPy не установлен.
+    """
+    values = as_float_array(amounts)
+    np = get_numpy()
+    if np is not None:
+        return np.multiply.outer(values, np.asarray(rates, dtype=np.float64))
+    return [array('d', [value * rate for rate in rates]) for value in values]
\ No newline at end of file
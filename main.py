@@ -1,11 +1,114 @@
-from converters import *
+import argparse
+import sys
 
-def main() -> None:
+from converters import (FixedPointConverter, RateFetcher, UsdCnyConverter, UsdEurConverter, UsdGbpConverter,
+                        UsdRubConverter)
+
+DEFAULT_CURRENCIES = "RUB,EUR,GBP,CNY"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(description="Конвертер валют из USD.")
+    parser.add_argument("--bulk", metavar="INPUT",
+                        help="Пакетный режим: файл CSV/JSONL с суммами в USD ('-' — стандартный ввод).")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Файл для результатов пакетного режима (по умолчанию стандартный вывод).")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="Формат входных данных (по умолчанию определяется по расширению).")
+    parser.add_argument("--column", default="amount", help="Имя столбца/ключа с суммой.")
+    parser.add_argument("--currencies", default=DEFAULT_CURRENCIES,
+                        help="Коды валют назначения через запятую.")
+    parser.add_argument("--chunk-size", type=int,
+                        help="Количество строк, конвертируемых за один проход.")
+    parser.add_argument("--exact", action="store_true",
+                        help="Точная конвертация в целых минорных единицах (интерактивный режим).")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Количество процессов для пакетного режима (0 — все ядра, 1 — без пула).")
+    parser.add_argument("--serve", metavar="ADDRESS", nargs="?", const="127.0.0.1:8080",
+                        help="Режим сервера: HTTP на host:port (по умолчанию 127.0.0.1:8080) "
+                             "или на Unix-сокете unix:/path/to.sock.")
+    parser.add_argument("--batch-window", type=float, default=1.0,
+                        help="Окно объединения запросов сервера в пакеты, мс.")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Записать профиль (интервалы загрузки кэша, запросов и конвертации) в PATH: "
+                             "Chrome Trace JSON или свернутые стеки для flamegraph, если PATH оканчивается на .folded.")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="Собирать метрики и записать их по завершении в формате Prometheus ('-' — stderr).")
+    return parser.parse_args(argv)
+
+
+def warn_if_stale() -> None:
+    """Предупреждение в stderr, если конвертация выполнена по устаревшим курсам (API недоступен)."""
+    rate_fetcher = RateFetcher()
+    if rate_fetcher.snapshot_age() is not None and rate_fetcher.is_stale():
+        print(f"Внимание: API курсов недоступен, использованы курсы возрастом "
+              f"{rate_fetcher.snapshot_age():.0f} с.", file=sys.stderr)
+
+
+def run_bulk(args) -> None:
     """
-    Основная функция для запуска конвертера валют.
+    Пакетная конвертация файла CSV/JSONL.
+
+    Курсы запрашиваются один раз, данные обрабатываются блоками, а по завершении
+    в stderr выводится скорость обработки.
+    """
+    # Модули пакетного режима импортируются только при его использовании
+    from converters.bulk import DEFAULT_CHUNK_SIZE, bulk_convert, detect_format, open_input, open_output
+    from converters.parallel import parallel_bulk_convert
+
+    chunk_size = args.chunk_size or DEFAULT_CHUNK_SIZE
+    currencies = [code.strip().upper() for code in args.currencies.split(",") if code.strip()]
+    input_format = args.format or detect_format(args.bulk)
+    output_format = detect_format(args.output) if args.output != "-" else input_format
+
+    parallel = args.workers != 1 and args.bulk != "-"
+    source = None if parallel else open_input(args.bulk)
+    target = open_output(args.output)
+    try:
+        if parallel:
+            stats = parallel_bulk_convert(args.bulk, target, currencies, input_format=input_format,
+                                          output_format=output_format, column=args.column,
+                                          workers=args.workers or None, chunk_size=chunk_size)
+        else:
+            stats = bulk_convert(source, target, currencies, input_format=input_format,
+                                 output_format=output_format, column=args.column, chunk_size=chunk_size)
+    except ValueError as e:
+        print(f"Ошибка во входных данных: {e}", file=sys.stderr)
+        return
+    finally:
+        if source not in (None, sys.stdin):
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    if stats is None:
+        print("Не удалось получить обменные курсы.", file=sys.stderr)
+        return
+    warn_if_stale()
+    print(f"Обработано строк: {stats['rows']} за {stats['seconds']:.3f} с "
+          f"({stats['rows_per_sec']:.0f} строк/с)", file=sys.stderr)
+
+
+def run_server(args) -> None:
+    """Режим сервера: курсы хранятся в памяти, запросы конвертируются пакетами до Ctrl+C."""
+    import asyncio
 
-    Запрашивает у пользователя сумму в USD, конвертирует ее в RUB, EUR, GBP, CNY
+    from converters.server import serve
+
+    try:
+        asyncio.run(serve(args.serve, batch_window=args.batch_window / 1000))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_interactive(exact=False) -> None:
+    """
+    Интерактивный режим: запрашивает у пользователя сумму в USD, конвертирует ее в RUB, EUR, GBP, CNY
     и выводит результаты на экран.
+
+    Args:
+        exact (bool): Использовать точную конвертацию в минорных единицах (FixedPointConverter).
     """
     try:
         amount_str = input('Введите значение в USD: \n')
@@ -17,12 +120,16 @@ def main() -> None:
         print("Некорректный ввод. Пожалуйста, введите целое число, представляющее сумму в USD.") # Более понятное сообщение
         return
 
-    converters = {
-        "RUB": UsdRubConverter(),
-        "EUR": UsdEurConverter(),
-        "GBP": UsdGbpConverter(),
-        "CNY": UsdCnyConverter(),
-    }
+    if exact:
+        fixed_point = FixedPointConverter()
+        converters = {currency: fixed_point for currency in ("RUB", "EUR", "GBP", "CNY")}
+    else:
+        converters = {
+            "RUB": UsdRubConverter(),
+            "EUR": UsdEurConverter(),
+            "GBP": UsdGbpConverter(),
+            "CNY": UsdCnyConverter(),
+        }
 
     for currency, converter in converters.items():
         converted_amount = converter.convert_usd(amount, currency)
@@ -30,6 +137,48 @@ def main() -> None:
             print(f"{amount} USD to {currency}: {converted_amount}")
         else:
             print(f"Не удалось конвертировать {amount} USD в {currency}.")
+    warn_if_stale()
+
+
+def write_metrics(path) -> None:
+    """Запись собранных метрик в файл path в текстовом формате Prometheus ('-' — stderr)."""
+    from converters.metrics import metrics
+
+    text = metrics.render_prometheus()
+    if path == "-":
+        sys.stderr.write(text)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def main(argv=None) -> None:
+    """
+    Основная функция для запуска конвертера валют.
+
+    Без аргументов работает в интерактивном режиме, с --bulk — в пакетном, с --serve — как сервер.
+    С --metrics по завершении выводит счетчики и задержки в формате Prometheus,
+    с --profile — записывает профиль выполнения.
+    """
+    args = parse_args(argv)
+    if args.metrics:
+        from converters.metrics import metrics
+        metrics.enable()
+    if args.profile:
+        from converters.tracing import tracer
+        tracer.enable()
+    try:
+        if args.serve:
+            run_server(args)
+        elif args.bulk:
+            run_bulk(args)
+        else:
+            run_interactive(exact=args.exact)
+    finally:
+        if args.metrics:
+            write_metrics(args.metrics)
+        if args.profile:
+            tracer.write(args.profile)
 
 
 if __name__ == "__main__":
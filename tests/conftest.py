@@ -0,0 +1,57 @@
+"""
+Общие фикстуры тестов: локальный API курсов (StubRateServer) и RateFetcher
+с кэш-файлами во временном каталоге.
+"""
+import logging
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stub_server import StubRateServer  # noqa: E402
+from converters import RateFetcher  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    """Логи RateFetcher не выводятся в отчет pytest."""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture
+def stub():
+    """Запущенный StubRateServer с курсами sample_payload()."""
+    with StubRateServer() as server:
+        yield server
+
+
+@pytest.fixture
+def make_fetcher(tmp_path):
+    """
+    Фабрика нового экземпляра RateFetcher (Singleton сбрасывается) с кэшем в tmp_path.
+
+    Фоновое обновление и пул хеджированных запросов останавливаются после теста.
+    """
+    created = []
+
+    def make(api_url=None, **options):
+        RateFetcher._instance = None
+        options.setdefault('cache_file', str(tmp_path / 'rates.cache'))
+        options.setdefault('retry_delay', 0.01)
+        if api_url is not None:
+            options['api_url'] = api_url
+        fetcher = RateFetcher(**options)
+        created.append(fetcher)
+        return fetcher
+
+    yield make
+    for fetcher in created:
+        fetcher.stop_background_refresh(timeout=1)
+        if fetcher._hedge_pool is not None:
+            fetcher._hedge_pool.shutdown(wait=False)
+    RateFetcher._instance = None
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+Тесты AsyncRateFetcher против локального API курсов (StubRateServer).
+"""
+import asyncio
+
+from benchmarks.stub_server import StubRateServer
+from converters import AsyncRateFetcher, TokenBucket
+from converters.quota import PRIORITY_HIGH
+
+
+def test_quota_wait_does_not_block_event_loop(stub, make_fetcher, tmp_path):
+    # Квота исчерпана: истекшие курсы ждут токен (~0,2 с), цикл событий продолжает работу
+    quota = TokenBucket(str(tmp_path / 'rates.quota'), rate=5, capacity=1, reserve=0)
+    fetcher = AsyncRateFetcher(make_fetcher(stub.url, quota=quota, quota_timeout=2))
+    assert quota.try_acquire(PRIORITY_HIGH) == 0
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        rate = await fetcher.get_rate('RUB')
+        task.cancel()
+        return rate, ticks
+
+    rate, ticks = asyncio.run(main())
+    assert rate == 92.5
+    assert ticks >= 5
+    assert stub.requests == 1
+
+def test_concurrent_misses_share_one_request(make_fetcher):
+    with StubRateServer(delay=0.2) as server:
+        fetcher = AsyncRateFetcher(make_fetcher(server.url))
+
+        async def main():
+            return await asyncio.gather(*(fetcher.get_rate('EUR') for _ in range(50)))
+
+        assert asyncio.run(main()) == [0.92] * 50
+        assert server.requests == 1
\ No newline at end of file
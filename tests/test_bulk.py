@@ -0,0 +1,92 @@
+"""
+Тесты потоковой пакетной конвертации CSV/JSONL.
+"""
+import io
+import json
+
+import pytest
+
+from converters.bulk import bulk_convert, iter_chunks, parse_amounts
+
+
+@pytest.mark.parametrize('lines, expected', [
+    (['amount\n', '1.5\n', '2\n'], [1.5, 2.0]),
+    (['id,amount\n', 'a,1.5\n', 'b,2\n'], [1.5, 2.0]),  # Столбец суммы ищется по заголовку
+    (['1.5,x\n', '2,y\n'], [1.5, 2.0]),  # Без заголовка сумма берется из первого столбца
+    (['amount\n', '\n', '3\n', '\n'], [3.0]),
+    ([], []),
+])
+def test_parse_amounts_csv(lines, expected):
+    assert list(parse_amounts(lines, 'csv')) == expected
+
+
+def test_parse_amounts_custom_column():
+    assert list(parse_amounts(['usd,id\n', '7,a\n'], 'csv', column='usd')) == [7.0]
+    assert list(parse_amounts(['{"usd": 7}\n'], 'jsonl', column='usd')) == [7.0]
+
+
+def test_parse_amounts_jsonl():
+    lines = ['{"amount": 1.5, "id": "a"}\n', '\n', '2\n', '"3"\n']
+    assert list(parse_amounts(lines, 'jsonl')) == [1.5, 2.0, 3.0]
+
+
+@pytest.mark.parametrize('lines, fmt, line_number', [
+    (['amount\n', '1\n', 'abc\n'], 'csv', 3),
+    (['id,amount\n', 'a,1\n', 'b\n'], 'csv', 3),  # Нет столбца суммы
+    (['1\n', '\n', '{"amount": null}\n'], 'jsonl', 3),
+    (['{"usd": 1}\n'], 'jsonl', 1),  # Нет ключа суммы
+    (['{broken\n'], 'jsonl', 1),
+    (['[1, 2]\n'], 'jsonl', 1),
+])
+def test_parse_amounts_reports_line_number(lines, fmt, line_number):
+    with pytest.raises(ValueError, match=f'строке {line_number}:'):
+        list(parse_amounts(lines, fmt))
+
+
+def test_iter_chunks():
+    assert list(iter_chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_chunks([], 2)) == []
+
+
+def test_bulk_convert_csv(stub, make_fetcher):
+    output = io.StringIO()
+    result = bulk_convert(io.StringIO('id,amount\na,1\nb,2.5\nc,3\n'), output, ['RUB', 'USD', 'XYZ'],
+                          rate_fetcher=make_fetcher(stub.url), chunk_size=2)
+    rate = stub.payload['rates']['RUB']
+    assert output.getvalue() == ('amount,RUB,USD,XYZ\n'
+                                 f'1.0,{1 * rate!r},1.0,\n'
+                                 f'2.5,{2.5 * rate!r},2.5,\n'
+                                 f'3.0,{3 * rate!r},3.0,\n')
+    assert result['rows'] == 3
+    assert stub.requests == 1  # Курсы запрашиваются один раз за запуск
+
+
+def test_bulk_convert_jsonl_to_csv_and_jsonl(stub, make_fetcher):
+    fetcher = make_fetcher(stub.url)
+    source = '{"amount": 2}\n4\n'
+    output = io.StringIO()
+    assert bulk_convert(io.StringIO(source), output, ['EUR', 'XYZ'], input_format='jsonl',
+                        rate_fetcher=fetcher)['rows'] == 2
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    rate = stub.payload['rates']['EUR']
+    assert records == [{'amount': 2.0, 'EUR': 2 * rate, 'XYZ': None}, {'amount': 4.0, 'EUR': 4 * rate, 'XYZ': None}]
+
+    output = io.StringIO()
+    bulk_convert(io.StringIO(source), output, ['EUR'], input_format='jsonl', output_format='csv',
+                 rate_fetcher=fetcher)
+    assert output.getvalue().splitlines()[0] == 'amount,EUR'
+    assert [float(row.split(',')[1]) for row in output.getvalue().splitlines()[1:]] == [2 * rate, 4 * rate]
+
+
+def test_bulk_convert_stops_at_bad_amount(stub, make_fetcher):
+    output = io.StringIO()
+    with pytest.raises(ValueError, match='строке 3'):
+        bulk_convert(io.StringIO('amount\n1\nx\n'), output, ['RUB'], rate_fetcher=make_fetcher(stub.url))
+
+
+def test_bulk_convert_without_rates(stub, make_fetcher, monkeypatch):
+    fetcher = make_fetcher(stub.url)
+    monkeypatch.setattr(fetcher, 'get_snapshot', lambda: None)
+    output = io.StringIO()
+    assert bulk_convert(io.StringIO('1\n'), output, ['RUB'], rate_fetcher=fetcher) is None
+    assert output.getvalue() == ''
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+Тесты точной конвертации в минорных единицах.
+"""
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP
+
+import pytest
+
+from converters import FixedPointConverter
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.mark.parametrize('rounding', [ROUND_HALF_EVEN, ROUND_HALF_UP])
+@pytest.mark.parametrize('currency', ['RUB', 'IRR', 'VND', 'JPY', 'KWD'])
+def test_batch_matches_exact_conversion_for_large_amounts(stub, make_fetcher, currency, rounding):
+    stub.payload['rates'].update(RUB=92.4567891, IRR=42087.125, VND=24567.5, JPY=151.123456789, KWD=0.30712)
+    converter = FixedPointConverter(make_fetcher(stub.url))
+    amounts = [0, 1, -1, 150, -250, 10 ** 8, -10 ** 8 - 7, 123_456_789_012, 10 ** 13 + 3, -10 ** 13]
+
+    result = converter.convert_minor_batch(amounts, currency, rounding)
+    assert isinstance(result, np.ndarray) and result.dtype == np.int64
+    assert result.tolist() == [converter.convert_minor(amount, currency, rounding) for amount in amounts]
+
+
+def test_batch_result_beyond_int64(stub, make_fetcher):
+    converter = FixedPointConverter(make_fetcher(stub.url))
+    amounts = [100, 2 ** 62]
+
+    result = converter.convert_minor_batch(amounts, 'RUB')
+    assert isinstance(result, np.ndarray)
+    assert list(result) == [9250, converter.convert_minor(2 ** 62, 'RUB')]
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+Тесты хеджированных запросов к нескольким источникам курсов.
+"""
+import time
+
+from benchmarks.stub_server import StubRateServer
+from converters import ExchangeRateApiProvider
+
+
+def test_slow_primary_is_hedged_by_secondary(make_fetcher):
+    with StubRateServer(delay=1.0) as slow, StubRateServer() as fast:
+        fetcher = make_fetcher(hedge_delay=0.1, providers=[ExchangeRateApiProvider(slow.url, name='slow'),
+                                                           ExchangeRateApiProvider(fast.url, name='fast')])
+        started = time.monotonic()
+        rates = fetcher._fetch_from_api()
+        elapsed = time.monotonic() - started
+
+        assert rates['provider'] == 'fast'
+        assert 0.1 <= elapsed < 0.5  # hedge_delay плюс ответ быстрого источника, без ожидания медленного
+        assert (slow.requests, fast.requests) == (1, 1)
+
+
+def test_fast_primary_is_not_hedged(make_fetcher):
+    with StubRateServer() as primary, StubRateServer() as secondary:
+        fetcher = make_fetcher(hedge_delay=0.5, providers=[ExchangeRateApiProvider(primary.url, name='primary'),
+                                                           ExchangeRateApiProvider(secondary.url, name='secondary')])
+        assert fetcher._fetch_from_api()['provider'] == 'primary'
+        assert secondary.requests == 0
+
+
+def test_failed_primary_is_hedged_without_waiting(make_fetcher):
+    with StubRateServer(fail_first=1, fail_status=500) as primary, StubRateServer() as secondary:
+        fetcher = make_fetcher(hedge_delay=2.0, providers=[ExchangeRateApiProvider(primary.url, name='primary'),
+                                                           ExchangeRateApiProvider(secondary.url, name='secondary')])
+        started = time.monotonic()
+        rates = fetcher._fetch_from_api()
+
+        assert rates['provider'] == 'secondary'
+        assert time.monotonic() - started < 1.0  # Ошибка основного источника не ждет hedge_delay
+        assert (primary.requests, secondary.requests) == (1, 1)
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Тесты многопроцессной пакетной конвертации.
+"""
+import io
+import json
+
+import pytest
+
+from converters.bulk import bulk_convert
+from converters.parallel import parallel_bulk_convert, read_header, split_byte_ranges
+
+CURRENCIES = ['RUB', 'EUR', 'XYZ']
+
+
+def make_input(fmt, rows=3000, header=True, trailing_newline=True) -> str:
+    """Содержимое входного файла с суммами разной длины."""
+    if fmt == 'jsonl':
+        lines = [json.dumps({'id': i, 'amount': i * 1.25}) if i % 2 else str(i / 3) for i in range(rows)]
+    else:
+        lines = (['id,amount'] if header else []) + [f'{i},{i * 1.25}' if header else f'{i * 1.25},{i}'
+                                                     for i in range(rows)]
+    return '\n'.join(lines) + ('\n' if trailing_newline else '')
+
+
+@pytest.mark.parametrize('input_format, output_format, header, trailing_newline', [
+    ('csv', 'csv', True, True),
+    ('csv', 'csv', False, False),
+    ('csv', 'jsonl', True, True),
+    ('jsonl', 'jsonl', False, True),
+    ('jsonl', 'csv', False, False),
+])
+def test_parallel_output_matches_serial(stub, make_fetcher, tmp_path, input_format, output_format, header,
+                                        trailing_newline):
+    path = tmp_path / f'amounts.{input_format}'
+    path.write_text(make_input(input_format, header=header, trailing_newline=trailing_newline))
+    fetcher = make_fetcher(stub.url)
+
+    serial = io.StringIO()
+    with open(path, encoding='utf-8') as f:
+        expected = bulk_convert(f, serial, CURRENCIES, input_format, output_format, rate_fetcher=fetcher,
+                                chunk_size=1000)
+    parallel = io.StringIO()
+    result = parallel_bulk_convert(str(path), parallel, CURRENCIES, input_format, output_format,
+                                   rate_fetcher=fetcher, workers=2, chunk_bytes=5000, chunk_size=1000)
+    assert len(split_byte_ranges(str(path), 0, 5000)) > 4  # Файл действительно разбит на несколько задач
+    assert parallel.getvalue() == serial.getvalue()
+    assert result['rows'] == expected['rows'] == 3000
+    assert stub.requests == 1
+
+
+def test_split_byte_ranges_align_to_lines(tmp_path):
+    path = tmp_path / 'amounts.csv'
+    data = make_input('csv', rows=500).encode()
+    path.write_bytes(data)
+    header, start = read_header(str(path), 'csv', 'amount')
+    assert header == 'id,amount\n' and start == len(header)
+
+    ranges = split_byte_ranges(str(path), start, 1000)
+    assert ranges[0][0] == start and ranges[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    assert all(data[end - 1:end] == b'\n' for _, end in ranges)
+
+
+def test_read_header_without_header(tmp_path):
+    path = tmp_path / 'amounts.csv'
+    path.write_text('1.5\n2\n')
+    assert read_header(str(path), 'csv', 'amount') == (None, 0)
+    assert read_header(str(path), 'jsonl', 'amount') == (None, 0)
+
+
+def test_parallel_reports_bad_amount(stub, make_fetcher, tmp_path):
+    path = tmp_path / 'amounts.csv'
+    path.write_text(make_input('csv', rows=100) + 'x,abc\n')
+    with pytest.raises(ValueError, match='Некорректная сумма'):
+        parallel_bulk_convert(str(path), io.StringIO(), CURRENCIES, rate_fetcher=make_fetcher(stub.url),
+                              workers=2, chunk_bytes=500)
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Тесты адаптеров источников курсов и обработки некорректных ответов API.
+"""
+import time
+
+import pytest
+
+from benchmarks.stub_server import StubRateServer, sample_payload
+from converters import ExchangeRateApiProvider, FrankfurterProvider, OpenErApiProvider
+from converters.circuit_breaker import CLOSED, OPEN
+
+MALFORMED = [
+    {'rates': {'EUR': None}},
+    {'rates': {'EUR': 'abc'}},
+    {'rates': {'EUR': float('nan')}},
+    {'rates': ['EUR']},
+    [1, 2],
+    'rates',
+]
+
+
+@pytest.mark.parametrize('payload', MALFORMED)
+@pytest.mark.parametrize('provider_class', [ExchangeRateApiProvider, OpenErApiProvider, FrankfurterProvider])
+def test_normalize_rejects_malformed_payload(provider_class, payload):
+    assert provider_class().normalize(payload) is None
+
+
+def test_normalize_rebases_to_usd():
+    data = FrankfurterProvider().normalize({'amount': 1.0, 'base': 'EUR', 'date': '2024-01-02',
+                                            'rates': {'USD': 1.1, 'GBP': 0.88}})
+    assert data['rates'] == {'USD': 1.0, 'EUR': pytest.approx(1 / 1.1), 'GBP': pytest.approx(0.8)}
+    assert data['time_last_updated'] == 1704153600
+
+
+@pytest.mark.parametrize('payload', MALFORMED)
+def test_malformed_response_returns_none(make_fetcher, payload):
+    with StubRateServer(payload=payload) as server:
+        fetcher = make_fetcher(server.url)
+        assert fetcher.fetch_rates() is None
+        assert server.requests == 1  # Некорректный ответ не повторяется
+
+
+def test_malformed_response_resolves_half_open_probe(make_fetcher):
+    with StubRateServer(payload={'rates': {'EUR': None}}) as server:
+        fetcher = make_fetcher(server.url, breaker_timeout=0.05)
+        fetcher.breaker.open_for(0)
+        assert fetcher._fetch_from_api() is None
+        assert fetcher.breaker.state == OPEN  # Пробный запрос неудачен, а не «завис» в half_open
+
+        server.payload = sample_payload()
+        time.sleep(0.15)
+        assert fetcher._fetch_from_api()['rates']['RUB'] == 92.5
+        assert fetcher.breaker.state == CLOSED
+        assert server.requests == 2
+
+class BrokenProvider(ExchangeRateApiProvider):
+    """Адаптер с ошибкой в normalize."""
+    def normalize(self, payload):
+        raise RuntimeError("adapter bug")
+
+
+def test_unexpected_error_resolves_half_open_probe(stub, make_fetcher):
+    fetcher = make_fetcher(providers=[BrokenProvider(stub.url)])
+    fetcher.breaker.open_for(0)
+    with pytest.raises(RuntimeError):
+        fetcher._fetch_from_api()
+    assert fetcher.breaker.state == OPEN
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Тесты файлового кэша курсов и межпроцессной блокировки.
+"""
+import os
+import struct
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from converters import RateCache, TokenBucket
+from converters.rate_cache import VERSION, FileLock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA = {'base': 'USD', 'date': '2024-01-01', 'etag': '"v1"', 'timestamp': 1704067200.5,
+        'rates': {'USD': 1.0, 'EUR': 0.92, 'RUB': 92.5}}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    cache = RateCache(str(tmp_path / 'rates.cache'))
+    assert cache.load() is None
+    cache.save(DATA)
+    assert cache.load() == DATA
+    assert os.listdir(tmp_path) == ['rates.cache']  # Временные файлы не остаются
+
+
+def test_readers_never_see_partial_file(tmp_path):
+    cache = RateCache(str(tmp_path / 'rates.cache'))
+    cache.save(DATA)
+    other = dict(DATA, rates={code: rate * 2 for code, rate in DATA['rates'].items()})
+    stop = threading.Event()
+    loaded = []
+
+    def read():
+        while not stop.is_set():
+            loaded.append(cache.load())
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(200):
+        cache.save(other if i % 2 else DATA)
+    stop.set()
+    reader.join()
+    assert loaded and all(data in (DATA, other) for data in loaded)
+
+
+@pytest.mark.parametrize('content', [b'', b'RCCH', b'garbage' * 10, b'{"rates": {}}'])
+def test_corrupt_file_is_ignored(tmp_path, content):
+    path = tmp_path / 'rates.cache'
+    path.write_bytes(content)
+    assert RateCache(str(path)).load() is None
+
+
+def test_truncated_file_is_ignored(tmp_path):
+    cache = RateCache(str(tmp_path / 'rates.cache'))
+    cache.save(DATA)
+    raw = (tmp_path / 'rates.cache').read_bytes()
+    (tmp_path / 'rates.cache').write_bytes(raw[:-4])
+    assert cache.load() is None
+
+
+def test_other_format_version_is_ignored(tmp_path):
+    cache = RateCache(str(tmp_path / 'rates.cache'))
+    cache.save(DATA)
+    raw = (tmp_path / 'rates.cache').read_bytes()
+    (tmp_path / 'rates.cache').write_bytes(raw[:4] + struct.pack('<H', VERSION - 1) + raw[6:])
+    assert cache.load() is None
+
+
+def test_lock_excludes_threads_and_processes(tmp_path):
+    path = str(tmp_path / 'rates.cache.lock')
+    lock = FileLock(path)
+    assert lock.acquire(blocking=False)
+    try:
+        results = []
+        thread = threading.Thread(target=lambda: results.append(lock.acquire(blocking=False)))
+        thread.start()
+        thread.join()
+        assert results == [False]
+
+        probe = (f"import sys; sys.path.insert(0, {ROOT!r}); from converters.rate_cache import FileLock; "
+                 f"print(FileLock({path!r}).acquire(blocking=False))")
+        output = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == 'False'
+    finally:
+        lock.release()
+    assert lock.acquire(blocking=False)
+    lock.release()
+
+
+def test_release_without_acquire_raises(tmp_path):
+    with pytest.raises(RuntimeError):
+        FileLock(str(tmp_path / 'x.lock')).release()
+
+
+def test_lock_in_missing_directory_raises_and_stays_usable(tmp_path):
+    lock = FileLock(str(tmp_path / 'missing' / 'x.lock'))
+    for blocking in (True, False, True):  # Блокировка потоков освобождается после ошибки
+        with pytest.raises(OSError):
+            lock.acquire(blocking)
+    with pytest.raises(OSError):
+        with lock:
+            pass
+
+
+def test_fetcher_with_unusable_cache_directory_still_fetches(stub, make_fetcher, tmp_path):
+    missing = tmp_path / 'missing'
+    fetcher = make_fetcher(stub.url, cache_file=str(missing / 'rates.cache'),
+                           quota=TokenBucket(str(missing / 'rates.quota')))
+    assert fetcher.fetch_rates()['rates']['RUB'] == 92.5
+    assert stub.requests == 1
\ No newline at end of file
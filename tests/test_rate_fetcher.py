@@ -0,0 +1,144 @@
+"""
+Тесты RateFetcher против локального API курсов (StubRateServer).
+"""
+import threading
+import time
+
+from benchmarks.stub_server import StubRateServer
+from converters import CrossRateConverter, TokenBucket
+from converters.circuit_breaker import CLOSED, HALF_OPEN, OPEN
+from converters.quota import PRIORITY_HIGH
+
+
+def test_quota_denial_releases_breaker_probe(stub, make_fetcher, tmp_path):
+    # После охлаждения выключатель пропускает пробный запрос, но квота исчерпана
+    quota = TokenBucket(str(tmp_path / 'rates.quota'), rate=10, capacity=1, reserve=0)
+    fetcher = make_fetcher(stub.url, quota=quota, quota_timeout=0)
+    fetcher.breaker.open_for(0)
+    assert quota.try_acquire(PRIORITY_HIGH) == 0
+
+    assert fetcher._fetch_from_api() is None
+    assert fetcher.breaker.state == OPEN  # Не застрял в half_open
+    assert stub.requests == 0
+
+    time.sleep(0.15)  # Квота пополнилась: пробный запрос выполняется и замыкает выключатель
+    assert fetcher._fetch_from_api()['rates']['RUB'] == 92.5
+    assert fetcher.breaker.state == CLOSED
+    assert stub.requests == 1
+
+
+def test_subscriber_can_read_rates_during_notification(stub, make_fetcher):
+    fetcher = make_fetcher(stub.url)
+    fetcher.get_snapshot()
+    seen = []
+
+    def on_change(changes, snapshot):
+        # Обработчик снова обращается к RateFetcher (при истекшем снимке — через _refresh)
+        seen.append((changes, fetcher._refresh().rates['EUR']))
+
+    fetcher.subscribe(on_change, currencies=('EUR',))
+    stub.payload = dict(stub.payload, rates=dict(stub.payload['rates'], EUR=0.95, RUB=93.0))
+
+    refresh = threading.Thread(target=fetcher._refresh, kwargs={'force': True}, daemon=True)
+    refresh.start()
+    refresh.join(timeout=5)
+    assert not refresh.is_alive(), "обработчик подписки заблокировал обновление"
+    assert seen == [({'EUR': (0.92, 0.95)}, 0.95)]  # Только валюты подписки
+
+
+def test_unchanged_rates_advance_subscribers_without_rebuild(make_fetcher):
+    with StubRateServer(etag='"v1"') as server:
+        fetcher = make_fetcher(server.url)
+        converter = CrossRateConverter(fetcher)
+        matrix = converter.get_matrix()
+        notified = []
+        fetcher.subscribe(lambda changes, snapshot: notified.append(changes))
+
+        snapshot = fetcher._refresh(force=True)  # Ответ 304: курсы те же, снимок новый
+        assert server.requests == 2
+        assert notified == [{}]
+        assert converter._snapshot is snapshot
+        assert converter.get_matrix() is matrix  # Матрица не перестраивается
+
+
+def test_background_refresh_clamps_lead_time(stub, make_fetcher):
+    fetcher = make_fetcher(stub.url, cache_expiry=1)
+    fetcher.start_background_refresh(lead_time=60)  # Больше cache_expiry: обновление раз в 0,5 с
+    time.sleep(0.3)
+    assert stub.requests == 1
+    time.sleep(0.6)
+    assert stub.requests == 2
+
+
+def test_retry_after_blocks_shared_quota(make_fetcher, tmp_path):
+    quota_file = str(tmp_path / 'rates.quota')
+    with StubRateServer(fail_first=1, fail_status=429, retry_after='1') as server:
+        first = make_fetcher(server.url, quota=TokenBucket(quota_file, rate=10, capacity=5))
+        assert first._fetch_from_api() is None
+        assert first.breaker.state == OPEN
+
+        # Другой процесс с той же квотой не обращается к API до истечения Retry-After
+        quota = TokenBucket(quota_file, rate=10, capacity=5)
+        second = make_fetcher(server.url, quota=quota, quota_timeout=0)
+        assert 0.5 < quota.retry_after() <= 1
+        assert second._fetch_from_api() is None
+        assert server.requests == 1
+
+        time.sleep(1.05)
+        assert second._fetch_from_api()['rates']['RUB'] == 92.5
+        assert server.requests == 2
+
+
+def test_breaker_recovers_through_half_open_with_quota(make_fetcher, tmp_path):
+    quota = TokenBucket(str(tmp_path / 'rates.quota'), rate=0.001, capacity=5, reserve=0)
+    with StubRateServer(fail_first=2, delay=0.2) as server:
+        fetcher = make_fetcher(server.url, quota=quota, max_retries=2, failure_threshold=2, breaker_timeout=0.2)
+        assert fetcher._fetch_from_api() is None
+        assert fetcher.breaker.state == OPEN
+        assert fetcher._fetch_from_api() is None  # Охлаждение: ни запроса, ни токена
+        assert server.requests == 2
+
+        time.sleep(0.25)
+        states = []
+        probe = threading.Thread(target=lambda: states.append(fetcher._fetch_from_api()))
+        probe.start()
+        time.sleep(0.1)  # Пробный запрос выполняется (ответ задержан на 0,2 с)
+        assert fetcher.breaker.state == HALF_OPEN
+        assert fetcher._fetch_from_api() is None  # Второй пробный запрос не разрешается
+        probe.join()
+
+        assert states[0]['rates']['RUB'] == 92.5
+        assert fetcher.breaker.state == CLOSED
+        assert server.requests == 3
+        assert quota.try_acquire(PRIORITY_HIGH) == 0 and quota.try_acquire(PRIORITY_HIGH) == 0
+        assert quota.try_acquire(PRIORITY_HIGH) > 0  # Токены потрачены только на 3 запроса
+
+
+def test_conditional_request_keeps_rates_on_304(make_fetcher):
+    with StubRateServer(etag='"v1"') as server:
+        fetcher = make_fetcher(server.url)
+        first = fetcher.get_snapshot()
+        assert first.data['etag'] == '"v1"'
+
+        # ETag тот же: сервер отвечает 304, курсы сохраняются, срок жизни продлевается
+        server.payload = dict(server.payload, rates=dict(server.payload['rates'], RUB=100.0))
+        second = fetcher._refresh(force=True)
+        assert server.requests == 2
+        assert second.rates['RUB'] == 92.5
+        assert second.timestamp > first.timestamp
+        assert fetcher.cache.load()['timestamp'] == second.timestamp
+
+        server.etag = '"v2"'
+        third = fetcher._refresh(force=True)
+        assert third.rates['RUB'] == 100.0
+        assert third.data['etag'] == '"v2"'
+
+def test_response_without_rates_counts_as_failure(make_fetcher):
+    with StubRateServer(payload={'result': 'error'}) as server:
+        fetcher = make_fetcher(server.url, failure_threshold=2)
+        assert fetcher._fetch_from_api() is None
+        assert fetcher.breaker.state == CLOSED
+        assert fetcher._fetch_from_api() is None
+        assert fetcher.breaker.state == OPEN  # Ответы 200 без курсов размыкают выключатель
+        assert fetcher._fetch_from_api() is None
+        assert server.requests == 2
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Тесты хранилища истории курсов и конвертации на момент времени.
+"""
+import math
+from datetime import datetime, timezone
+
+import pytest
+
+from converters import HistoricalRateStore, rate_history, vectorized
+
+np = pytest.importorskip('numpy')
+
+SNAPSHOTS = [
+    (100.0, {'EUR': 0.9, 'RUB': 90.0}),
+    (200.0, {'EUR': 0.8}),  # RUB отсутствует — в столбце NaN
+    (300.0, {'EUR': 0.7, 'RUB': 70.0, 'GBP': 0.5}),  # GBP нет в заголовке
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    history = HistoricalRateStore(str(tmp_path / 'history.bin'))
+    for timestamp, rates in SNAPSHOTS:
+        assert history.append({'rates': rates}, timestamp)
+    yield history
+    history.close()
+
+
+def test_empty_store(tmp_path):
+    history = HistoricalRateStore(str(tmp_path / 'history.bin'))
+    assert len(history) == 0
+    assert history.last_timestamp() is None
+    assert history.find(100) is None
+    assert history.convert_at(1, 'EUR', 100) is None
+    assert list(history.convert_at_batch([1.0], 'EUR', [100.0])) == [pytest.approx(math.nan, nan_ok=True)]
+
+
+@pytest.mark.parametrize('timestamp, position', [
+    (99.9, None), (100, 0), (150, 0), (199.999, 0), (200, 1), (250, 1), (300, 2), (1e12, 2),
+])
+def test_find_boundaries(store, timestamp, position):
+    assert store.find(timestamp) == position
+
+
+def test_find_accepts_datetime(store):
+    assert store.find(datetime.fromtimestamp(250, tz=timezone.utc)) == 1
+
+
+def test_convert_at(store):
+    assert store.convert_at(10, 'EUR', 100) == pytest.approx(9.0)
+    assert store.convert_at(10, 'EUR', 299) == pytest.approx(8.0)
+    assert store.convert_at(10, 'RUB', 250) is None  # NaN-столбец: валюты не было в снимке
+    assert store.convert_at(10, 'RUB', 300) == pytest.approx(700.0)
+    assert store.convert_at(10, 'GBP', 300) is None  # Валюта не входит в набор столбцов
+    assert store.convert_at(10, 'EUR', 50) is None
+
+
+def test_append_rejects_older_snapshots_and_reopens(store):
+    assert not store.append({'rates': {'EUR': 0.1}}, 300)
+    assert not store.append({'rates': {'EUR': 0.1}}, 250)
+    assert store.append({'time_last_updated': 400, 'rates': {'EUR': 0.6}})
+    assert len(store) == 4
+
+    reopened = HistoricalRateStore(store.path)
+    assert reopened.currencies == ('EUR', 'RUB')
+    assert reopened.last_timestamp() == 400
+    assert reopened.convert_at(10, 'EUR', 1000) == pytest.approx(6.0)
+    reopened.close()
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'history.bin'
+    path.write_bytes(b'not a history file')
+    with pytest.raises(ValueError):
+        HistoricalRateStore(str(path))
+
+
+@pytest.mark.parametrize('use_numpy', [True, False], ids=['numpy', 'fallback'])
+def test_convert_at_batch(store, monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(rate_history, 'get_numpy', lambda: None)
+        monkeypatch.setattr(vectorized, 'get_numpy', lambda: None)
+    amounts = [10, 10, 10, 10, 10]
+    moments = [50, 100, 250, 300, 1e12]
+    expected = [store.convert_at(amount, 'RUB', moment) for amount, moment in zip(amounts, moments)]
+    result = store.convert_at_batch(amounts, 'RUB', moments)
+    assert list(result) == [pytest.approx(math.nan, nan_ok=True) if value is None else pytest.approx(value)
+                            for value in expected]
+    assert [math.isnan(value) for value in result] == [True, False, True, False, False]
+
+    unknown = store.convert_at_batch(amounts, 'GBP', moments)
+    assert all(math.isnan(value) for value in unknown)
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Тесты сервера конвертации на asyncio.
+"""
+import asyncio
+import json
+
+import pytest
+
+from converters import ConversionServer
+
+
+async def request(port, raw) -> tuple:
+    """Отправка сырого HTTP-запроса; возвращает (статус, тело JSON)."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(raw)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), timeout=5)
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body)
+
+
+def run_with_server(fetcher, scenario):
+    """Запуск ConversionServer на свободном порту на время scenario(port)."""
+    async def main():
+        server = ConversionServer(fetcher, batch_window=0.001)
+        await server.start('127.0.0.1:0')
+        try:
+            return await scenario(server.sockets[0].getsockname()[1])
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_handlers_use_snapshot_from_async_fetcher(stub, make_fetcher):
+    fetcher = make_fetcher(stub.url)
+
+    async def scenario(port):
+        def blocking_get_snapshot():
+            raise AssertionError("синхронный get_snapshot вызван в цикле событий")
+
+        fetcher.get_snapshot = blocking_get_snapshot
+        body = json.dumps({'amounts': [1, 2], 'currencies': ['RUB', 'EUR']}).encode()
+        batch = await request(port, b'POST /convert/batch HTTP/1.1\r\nConnection: close\r\n'
+                                    b'Content-Length: %d\r\n\r\n%s' % (len(body), body))
+        single = await request(port, b'GET /convert?amount=2&to=RUB HTTP/1.1\r\nConnection: close\r\n\r\n')
+        return batch, single
+
+    batch, single = run_with_server(fetcher, scenario)
+    assert batch == (200, {'from': 'USD', 'currencies': ['RUB', 'EUR'],
+                           'results': [[92.5, 0.92], [185.0, 1.84]], 'stale': False})
+    assert single[0] == 200 and single[1]['result'] == 185.0
+
+
+@pytest.mark.parametrize('length', [b'abc', b'-5', b'1_0'])
+def test_invalid_content_length_is_rejected(stub, make_fetcher, length):
+    async def scenario(port):
+        return await request(port, b'POST /convert/batch HTTP/1.1\r\nContent-Length: ' + length + b'\r\n\r\n{}')
+
+    assert run_with_server(make_fetcher(stub.url), scenario) == (400, {'error': 'invalid Content-Length'})
+
+@pytest.mark.parametrize('amount', [b'1e309', b'-inf', b'nan'])
+def test_non_finite_amount_is_rejected(stub, make_fetcher, amount):
+    async def scenario(port):
+        single = await request(port, b'GET /convert?amount=' + amount + b'&to=EUR HTTP/1.1\r\nConnection: close\r\n\r\n')
+        body = b'{"amounts": [1, "%s"], "currencies": ["EUR"]}' % amount
+        batch = await request(port, b'POST /convert/batch HTTP/1.1\r\nConnection: close\r\n'
+                                    b'Content-Length: %d\r\n\r\n%s' % (len(body), body))
+        return single, batch
+
+    single, batch = run_with_server(make_fetcher(stub.url), scenario)
+    assert single[0] == 400 and 'finite' in single[1]['error']
+    assert batch[0] == 400
+
+
+@pytest.mark.filterwarnings('ignore:overflow encountered')
+def test_overflowing_result_is_rejected(stub, make_fetcher):
+    async def scenario(port):
+        return await request(port, b'GET /convert?amount=1e308&to=RUB HTTP/1.1\r\nConnection: close\r\n\r\n')
+
+    assert run_with_server(make_fetcher(stub.url), scenario) == (400, {'error': 'conversion result is out of range'})
\ No newline at end of file
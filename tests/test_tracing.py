@@ -0,0 +1,110 @@
+"""
+Тесты трассировки: вложенность интервалов, форматы выгрузки и интервалы рабочих процессов.
+"""
+import io
+import json
+import os
+
+import pytest
+
+from converters.parallel import parallel_bulk_convert
+from converters.tracing import NULL_SPAN, Tracer, profiling, tracer
+
+
+@pytest.fixture
+def global_tracer():
+    tracer.disable()
+    tracer.reset()
+    yield tracer
+    tracer.disable()
+    tracer.reset()
+
+
+def test_disabled_tracer_records_nothing():
+    local = Tracer()
+    assert local.span('a') is NULL_SPAN
+    with local.span('a') as span:
+        span.set(rows=1)
+    assert local.events() == []
+
+
+def test_nested_spans_record_stack_and_args():
+    local = Tracer()
+    local.enable()
+    with local.span('outer', size=1):
+        with local.span('inner') as span:
+            span.set(rows=5)
+    with pytest.raises(KeyError):
+        with local.span('failed'):
+            raise KeyError('x')
+
+    inner, outer, failed = local.events()
+    assert (inner[0], inner[6], inner[5]) == ('inner', ('outer', 'inner'), {'rows': 5})
+    assert (outer[0], outer[6], outer[5]) == ('outer', ('outer',), {'size': 1})
+    assert failed[5] == {'error': 'KeyError'}
+    assert outer[1] <= inner[1] and inner[1] + inner[2] <= outer[1] + outer[2]
+    assert inner[3] == os.getpid()
+
+
+def test_max_events_counts_dropped():
+    local = Tracer(max_events=1)
+    local.enable()
+    for _ in range(2):
+        with local.span('a'):
+            pass
+    local.extend(local.events())
+    assert len(local.events()) == 1
+    assert local.dropped == 2
+    assert local.chrome_trace()['otherData'] == {'dropped_events': 2}
+
+
+def test_chrome_trace_and_folded():
+    local = Tracer()
+    local.enable()
+    with local.span('cache.load'):
+        with local.span('cache.parse'):
+            pass
+    trace = local.chrome_trace()
+    assert [(e['name'], e['cat'], e['ph'], e['pid']) for e in trace['traceEvents']] == [
+        ('cache.parse', 'cache', 'X', os.getpid()), ('cache.load', 'cache', 'X', os.getpid())]
+    assert all(e['ts'] >= 0 and e['dur'] >= 0 for e in trace['traceEvents'])
+
+    foreign = [('worker.span', local._origin, 5_000, 12345, 1, {}, ('worker.span',))]
+    local.extend(foreign)
+    assert local.chrome_trace()['traceEvents'][-1]['pid'] == 12345
+    folded = dict(line.rsplit(' ', 1) for line in local.folded())
+    assert set(folded) == {'cache.load', 'cache.load;cache.parse', 'worker.span'}
+    assert folded['worker.span'] == '5'
+    assert local.drain() and local.events() == []
+
+
+@pytest.mark.parametrize('suffix', ['json', 'folded'])
+def test_profiling_writes_trace(global_tracer, tmp_path, suffix):
+    path = str(tmp_path / f'trace.{suffix}')
+    with profiling(path) as active:
+        assert active is tracer and tracer.enabled
+        with tracer.span('block'):
+            pass
+    assert not tracer.enabled
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    if suffix == 'json':
+        assert [e['name'] for e in json.loads(text)['traceEvents']] == ['block']
+    else:
+        assert text.startswith('block ')
+
+
+def test_parallel_workers_record_spans(global_tracer, stub, make_fetcher, tmp_path):
+    path = tmp_path / 'amounts.csv'
+    path.write_text('amount\n' + ''.join(f'{i}.5\n' for i in range(2000)))
+    with profiling():
+        result = parallel_bulk_convert(str(path), io.StringIO(), ['RUB'], rate_fetcher=make_fetcher(stub.url),
+                                       workers=2, chunk_bytes=2000)
+    assert result['rows'] == 2000
+    events = tracer.events()
+    ranges = [e for e in events if e[0] == 'parallel.convert_range']
+    assert len(ranges) > 1
+    assert sum(e[5]['rows'] for e in ranges) == 2000
+    assert {e[3] for e in ranges} - {os.getpid()}  # Интервалы записаны рабочими процессами
+    assert any(e[6] == ('parallel.convert_range', 'bulk.convert_chunk') for e in events)
+    assert [e[0] for e in events if e[3] == os.getpid()].count('parallel.convert') == 1
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Тесты конвертеров USD в отдельные валюты.
+"""
+import time
+
+import pytest
+
+from converters import UsdEurConverter, UsdGbpConverter, UsdRubConverter
+
+
+@pytest.mark.parametrize('converter_class', [UsdRubConverter, UsdEurConverter, UsdGbpConverter])
+def test_saved_rate_is_refreshed_after_expiry(stub, make_fetcher, converter_class):
+    fetcher = make_fetcher(stub.url, cache_expiry=0.2, stale_ttl=0)
+    converter = converter_class(fetcher)
+    currency = converter.currency
+    rate = stub.payload['rates'][currency]
+    assert converter.convert_usd(2, currency) == 2 * rate
+    assert converter.convert_usd(2, currency) == 2 * rate
+    assert stub.requests == 1  # До истечения срока курс берется из converter.rates
+
+    stub.payload = dict(stub.payload, rates=dict(stub.payload['rates'], **{currency: 100.0}))
+    time.sleep(0.3)
+    assert converter.convert_usd(2, currency) == 200.0
+    assert stub.requests == 2
\ No newline at end of file
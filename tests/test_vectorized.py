@@ -0,0 +1,32 @@
+"""
+Тесты векторизованной конвертации с NumPy и с резервной реализацией на array('d').
+"""
+import math
+from array import array
+
+import pytest
+
+from converters import UsdRubConverter, vectorized
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.mark.parametrize('amounts', [
+    [1, 2, 3, 4],
+    np.array([1, 2, 3, 4], dtype=np.int64),
+    np.array([1, 2, 3, 4], dtype=np.float32),
+    memoryview(array('i', [1, 2, 3, 4])),
+    memoryview(array('d', [1, 2, 3, 4])),
+    memoryview(np.array([[1, 2], [3, 4]], dtype=np.int32)),
+], ids=['list', 'ndarray-int', 'ndarray-float32', 'memoryview-int', 'memoryview-double', 'memoryview-2d'])
+@pytest.mark.parametrize('use_numpy', [True, False], ids=['numpy', 'fallback'])
+def test_convert_usd_batch(stub, make_fetcher, monkeypatch, amounts, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(vectorized, 'get_numpy', lambda: None)
+    rate = stub.payload['rates']['RUB']
+    result = UsdRubConverter(make_fetcher(stub.url)).convert_usd_batch(amounts, ['RUB', 'EUR'])
+    assert isinstance(result, np.ndarray) == use_numpy
+    assert len(result) == 4
+    for amount, row in zip([1, 2, 3, 4], result):
+        assert row[0] == amount * rate  # Значения, а не переинтерпретированные байты буфера
+        assert math.isnan(row[1])
\ No newline at end of file